@@ -12,8 +12,19 @@ class Config:
     # Model
     LLM_MODEL = "models/gemini-2.5-flash"
     
+    # Model cascade: score everyone with the fast model, re-score only
+    # candidates within CASCADE_BAND points of CASCADE_THRESHOLD with LLM_MODEL
+    CASCADE_ENABLED = os.getenv("CASCADE_ENABLED", "False").lower() == "true"
+    LLM_MODEL_FAST = os.getenv("LLM_MODEL_FAST", "models/gemini-2.5-flash-lite")
+    CASCADE_THRESHOLD = float(os.getenv("CASCADE_THRESHOLD", 60))
+    CASCADE_BAND = float(os.getenv("CASCADE_BAND", 10))
+    
     # Database
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///resume_matcher.db")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
     
     # Scoring
     MAX_SCORE = 100
@@ -22,8 +33,42 @@ class Config:
     # UI
     FLASK_PORT = int(os.getenv("FLASK_PORT", 5000))
     FLASK_DEBUG = os.getenv("FLASK_DEBUG", "False").lower() == "true"
+    ASYNC_MODE = os.getenv("ASYNC_MODE", "False").lower() == "true"
+    ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", 10))
     
     # Limits
     MAX_RESUME_LENGTH = 10000
     MAX_JD_LENGTH = 5000
     MAX_RETRIES = 3
+    MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_MB", 256)) * 1024 * 1024  # /api/batch only
+    MAX_RESUME_FILE_BYTES = 10 * 1024 * 1024
+    
+    # Upload storage
+    UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "uploads")
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_MB", 512)) * 1024 * 1024
+    UPLOAD_MAX_AGE_SECONDS = int(os.getenv("UPLOAD_MAX_AGE_HOURS", 24 * 7)) * 3600
+    
+    # Request coalescing
+    SINGLE_FLIGHT_CROSS_WORKER = os.getenv("SINGLE_FLIGHT_CROSS_WORKER", "False").lower() == "true"
+    SINGLE_FLIGHT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", 120))
+    SINGLE_FLIGHT_POLL_INTERVAL = 0.5
+    
+    # Near-duplicate detection ("reuse" stored scores, "flag" only, or "off")
+    NEAR_DUP_MODE = os.getenv("NEAR_DUP_MODE", "reuse").lower()
+    NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", 0.9))
+    MINHASH_NUM_PERM = 128
+    
+    # Batch processing
+    BATCH_PARSE_WORKERS = int(os.getenv("BATCH_PARSE_WORKERS", os.cpu_count() or 2))
+    BATCH_SCORE_CONCURRENCY = int(os.getenv("BATCH_SCORE_CONCURRENCY", 4))
+    BATCH_CHECKPOINT_EVERY = int(os.getenv("BATCH_CHECKPOINT_EVERY", 50))
+    BATCH_CHECKPOINT_INTERVAL = float(os.getenv("BATCH_CHECKPOINT_INTERVAL", 10))
+    BATCH_JOB_TTL_HOURS = float(os.getenv("BATCH_JOB_TTL_HOURS", 24))
+    BATCH_HEARTBEAT_TIMEOUT = float(os.getenv("BATCH_HEARTBEAT_TIMEOUT", 120))
+    
+    # Watch-folder ingestion
+    WATCH_WORKERS = int(os.getenv("WATCH_WORKERS", BATCH_SCORE_CONCURRENCY))
+    WATCH_SETTLE_SECONDS = float(os.getenv("WATCH_SETTLE_SECONDS", 2))
+    WATCH_POLL_INTERVAL = float(os.getenv("WATCH_POLL_INTERVAL", 5))
+    WATCH_RESCAN_INTERVAL = float(os.getenv("WATCH_RESCAN_INTERVAL", 600))
+    WATCH_RETRY_SECONDS = float(os.getenv("WATCH_RETRY_SECONDS", 60))
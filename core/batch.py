@@ -0,0 +1,648 @@
+"""
+Batch Module
+Bulk parsing and scoring of many resumes against one job description
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, BinaryIO, Collection, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from config import Config
+from core.cascade import CascadeStats
+from core.dedup import LSHIndex, MinHasher
+from core.resume_parser import ResumeParser
+
+# Source prefix of runs created by web uploads; their files exist only in
+# the uploading worker's temp spool, so they cannot be resumed from the CLI
+WEB_RUN_PREFIX = "upload:"
+
+_hasher: Optional[MinHasher] = None
+
+
+def iter_archive(
+    fileobj: BinaryIO,
+    names: Optional[Collection[str]] = None,
+) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """
+    Yield (name, content) for each supported resume in a ZIP archive
+
+    Entries are decompressed one at a time from the archive stream, so
+    nothing is extracted to disk. Oversized entries are yielded with
+    ``None`` content so they are reported as failures instead of dropped.
+    If ``names`` is given, other entries are skipped without being read.
+    """
+    with zipfile.ZipFile(fileobj) as archive:
+        for name, info in _supported_entries(archive):
+            if names is not None and name not in names:
+                continue
+
+            if info.file_size > Config.MAX_RESUME_FILE_BYTES:
+                yield name, None
+                continue
+
+            with archive.open(info) as entry:
+                yield name, entry.read()
+
+
+def list_archive(fileobj: BinaryIO) -> List[str]:
+    """List supported resume names in a ZIP archive without reading them"""
+    with zipfile.ZipFile(fileobj) as archive:
+        return [name for name, _ in _supported_entries(archive)]
+
+
+def list_source(source: str) -> List[str]:
+    """List supported resume names in a directory or ZIP archive"""
+    if zipfile.is_zipfile(source):
+        with open(source, "rb") as f:
+            return list_archive(f)
+
+    names = []
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.startswith(".") or os.path.splitext(filename)[1].lower() not in ResumeParser.SUPPORTED_FORMATS:
+                continue
+            names.append(os.path.relpath(os.path.join(root, filename), source))
+    return names
+
+
+def iter_source(
+    source: str,
+    names: Optional[Collection[str]] = None,
+) -> Iterator[Tuple[str, Union[bytes, OSError, None]]]:
+    """
+    Yield (name, content) from a directory or ZIP archive
+
+    Oversized files are yielded with ``None`` content and unreadable ones
+    (e.g. deleted since the run was created) with the ``OSError``, so both
+    are reported as failures with the right reason.
+
+    Args:
+        source: Directory or ZIP path
+        names: If given, only these entries are read
+    """
+    if zipfile.is_zipfile(source):
+        with open(source, "rb") as f:
+            for name, data in iter_archive(f, names):
+                yield name, data
+        return
+
+    for name in list_source(source) if names is None else names:
+        path = os.path.join(source, name)
+        try:
+            if os.path.getsize(path) > Config.MAX_RESUME_FILE_BYTES:
+                yield name, None
+                continue
+            with open(path, "rb") as f:
+                yield name, f.read()
+        except FileNotFoundError:
+            yield name, FileNotFoundError(f"File not found: {path}")
+        except OSError as e:
+            yield name, e
+
+
+def _supported_entries(archive: zipfile.ZipFile) -> Iterator[Tuple[str, zipfile.ZipInfo]]:
+    """Yield (name, ZipInfo) for supported resume entries without reading them"""
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+
+        name = info.filename
+        basename = os.path.basename(name)
+        if not basename or basename.startswith(".") or name.startswith("__MACOSX/"):
+            continue
+
+        if os.path.splitext(basename)[1].lower() not in ResumeParser.SUPPORTED_FORMATS:
+            continue
+
+        yield name, info
+
+
+def _parse_entry(name: str, data: Union[bytes, OSError, None], with_signature: bool = False) -> Dict[str, Any]:
+    """Parse a single archive entry and optionally MinHash it (runs in a worker process)"""
+    global _hasher
+
+    if data is None:
+        return {"name": name, "text": None, "error": "File is too large"}
+    if isinstance(data, OSError):
+        return {"name": name, "text": None, "error": str(data)}
+
+    try:
+        text = ResumeParser.parse_bytes(data, name)
+        ResumeParser.validate(text, max_length=Config.MAX_RESUME_LENGTH)
+    except Exception as e:
+        return {"name": name, "text": None, "error": str(e)}
+
+    signature = None
+    if with_signature:
+        _hasher = _hasher or MinHasher()
+        signature = _hasher.signature(text)
+
+    return {"name": name, "text": text, "signature": signature, "error": None}
+
+
+def save_run_stats(db, run_id: int, stats: CascadeStats) -> CascadeStats:
+    """
+    Add one session's model call counters to a run's stored totals
+
+    Returns:
+        The run's totals across all of its sessions
+    """
+    run = db.get_run(run_id)
+    totals = CascadeStats(stats.threshold, stats.band)
+    totals.add_state(run["stats"] if run else {})
+    totals.add_state(stats.state())
+    db.set_run_stats(run_id, totals.state())
+    return totals
+
+
+class RunCheckpointer:
+    """
+    Buffer per-item outcomes of a persisted batch run and write them in bulk
+
+    Outcomes are flushed every ``every`` items or ``interval`` seconds, so a
+    crash loses at most one buffer of work instead of paying one commit per
+    item. Lost items are still pending and are redone on resume.
+
+    Each flush also refreshes the run's ``updated_at``; ``heartbeat`` keeps
+    flushing while no item finishes, so a run whose heartbeat goes stale
+    belongs to a process that died.
+    """
+
+    def __init__(
+        self,
+        db,
+        item_ids: Dict[str, int],
+        run_id: Optional[int] = None,
+        every: Optional[int] = None,
+        interval: Optional[float] = None,
+    ):
+        """Initialize checkpointer for a run's items (name -> item ID)"""
+        self.db = db
+        self.item_ids = item_ids
+        self.run_id = run_id
+        self.every = every or Config.BATCH_CHECKPOINT_EVERY
+        self.interval = interval or Config.BATCH_CHECKPOINT_INTERVAL
+        self._buffer: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, name: str, status: str, score: Optional[float] = None,
+               match_id: Optional[int] = None, error: Optional[str] = None,
+               explanation: Optional[str] = None, recommendations: Optional[List[str]] = None,
+               duplicate_of: Optional[str] = None, near_duplicate_of: Optional[int] = None,
+               similarity: Optional[float] = None):
+        """Buffer the outcome of one item, flushing when the buffer is due"""
+        item_id = self.item_ids.get(name)
+        if item_id is None:
+            return
+
+        with self._lock:
+            self._buffer.append({
+                "id": item_id,
+                "status": status,
+                "duplicate_of": duplicate_of,
+                "near_duplicate_of": near_duplicate_of,
+                "similarity": similarity,
+                "score": score,
+                "explanation": explanation,
+                "recommendations": json.dumps(recommendations) if recommendations is not None else None,
+                "match_id": match_id,
+                "error": error,
+                "updated_at": datetime.utcnow(),
+            })
+            if len(self._buffer) >= self.every or time.monotonic() - self._last_flush >= self.interval:
+                self._flush_locked()
+
+    def flush(self):
+        """Write all buffered outcomes"""
+        with self._lock:
+            self._flush_locked()
+
+    def heartbeat(self, stop: threading.Event):
+        """Flush every ``interval`` seconds until ``stop`` is set (run in a thread)"""
+        try:
+            while not stop.wait(self.interval):
+                self.flush()
+        finally:
+            self.db.remove_session()
+
+    def _flush_locked(self):
+        """Write buffered outcomes in one transaction (caller holds the lock)"""
+        self.db.update_run_items(self._buffer, self.run_id)
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+
+class BatchJob:
+    """Progress and results of one batch screening job"""
+
+    def __init__(
+        self,
+        jd_text: str,
+        checkpointer: Optional[RunCheckpointer] = None,
+        run_id: Optional[int] = None,
+    ):
+        self.id = run_id if run_id is not None else uuid.uuid4().hex
+        self.run_id = run_id
+        self.checkpointer = checkpointer
+        self.jd_text = jd_text
+        self.status = "pending"
+        self.total = 0
+        self.parsed = 0
+        self.scored = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.results: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add_entry(self):
+        """Count a newly discovered archive entry"""
+        with self._lock:
+            self.total += 1
+
+    def mark_parsed(self):
+        """Count an entry whose text was extracted"""
+        with self._lock:
+            self.parsed += 1
+
+    def add_result(self, result: Dict[str, Any]):
+        """
+        Record a scored entry
+
+        An entry marked ``reused`` copied its score from the stored match in
+        ``near_duplicate_of`` and counts as a duplicate.
+        """
+        reused = result.get("reused", False)
+        with self._lock:
+            if reused:
+                self.duplicates += 1
+            else:
+                self.scored += 1
+            self.results.append(result)
+
+        if self.checkpointer:
+            self.checkpointer.record(
+                result["name"], "duplicate" if reused else "completed",
+                score=result.get("score"),
+                match_id=result.get("id"),
+                explanation=result.get("explanation"),
+                recommendations=result.get("recommendations"),
+                near_duplicate_of=result.get("near_duplicate_of"),
+                similarity=result.get("similarity"),
+            )
+
+    def add_duplicate(self, name: str, duplicate_of: str, similarity: float, result: Dict[str, Any]):
+        """Record an entry that reuses the result of a near-duplicate in the batch"""
+        entry = {
+            "name": name,
+            "duplicate_of": duplicate_of,
+            "similarity": round(similarity, 3),
+            "score": result.get("score"),
+            "explanation": result.get("explanation"),
+            "recommendations": result.get("recommendations", []),
+            "id": result.get("id"),
+        }
+        with self._lock:
+            self.duplicates += 1
+            self.results.append(entry)
+
+        if self.checkpointer:
+            self.checkpointer.record(
+                name, "duplicate",
+                duplicate_of=duplicate_of,
+                similarity=entry["similarity"],
+                score=entry["score"],
+                match_id=entry["id"],
+                explanation=entry["explanation"],
+                recommendations=entry["recommendations"],
+            )
+
+    def add_failure(self, name: str, error: str):
+        """Record an entry that could not be parsed or scored"""
+        with self._lock:
+            self.failed += 1
+            self.results.append({"name": name, "error": error})
+
+        if self.checkpointer:
+            self.checkpointer.record(name, "failed", error=error)
+
+    def to_dict(self, include_results: bool = True) -> Dict[str, Any]:
+        """Convert job progress to dictionary"""
+        with self._lock:
+            data = {
+                "id": self.id,
+                "status": self.status,
+                "total": self.total,
+                "parsed": self.parsed,
+                "scored": self.scored,
+                "failed": self.failed,
+                "duplicates": self.duplicates,
+                "error": self.error,
+                "created_at": self.created_at.isoformat(),
+            }
+            if include_results:
+                data["results"] = sorted(
+                    self.results,
+                    key=lambda r: r.get("score", -1),
+                    reverse=True,
+                )
+            return data
+
+
+class _InBatchDuplicates:
+    """
+    Near-duplicate detection within one batch
+
+    A duplicate is not settled until its original has an outcome: it then
+    copies the original's result, or is scored itself if the original failed.
+    """
+
+    def __init__(self, threshold: float, num_perm: int):
+        self.threshold = threshold
+        self.index = LSHIndex(threshold, num_perm)
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+        self._lock = threading.Lock()
+        self._waiting: Dict[str, List[Tuple[str, str, Tuple[int, ...], float]]] = {}
+        self._outcomes: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def find(self, signature: Tuple[int, ...]) -> Optional[Tuple[str, float]]:
+        """Find the most similar entry already queued in this batch"""
+        best = None
+        for name in self.index.query(signature):
+            similarity = MinHasher.similarity(signature, self.signatures[name])
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (name, similarity)
+        return best
+
+    def add(self, name: str, signature: Tuple[int, ...]):
+        """Index an entry that will be scored"""
+        self.index.insert(name, signature)
+        self.signatures[name] = signature
+
+    def defer(self, original: str, duplicate: Tuple[str, str, Tuple[int, ...], float]):
+        """
+        Wait for ``original``'s outcome
+
+        Returns:
+            Tuple of (settled, result); ``settled`` is True if the original
+            already finished, with ``result`` None if it failed
+        """
+        with self._lock:
+            if original in self._outcomes:
+                return True, self._outcomes[original]
+            self._waiting.setdefault(original, []).append(duplicate)
+            return False, None
+
+    def resolve(self, name: str, result: Optional[Dict[str, Any]]) -> List[Tuple[str, str, Tuple[int, ...], float]]:
+        """Record an entry's outcome (None if failed) and return its waiting duplicates"""
+        with self._lock:
+            self._outcomes[name] = result
+            return self._waiting.pop(name, [])
+
+
+class BatchProcessor:
+    """Parse resumes in a process pool and score them with bounded concurrency"""
+
+    def __init__(
+        self,
+        matcher,
+        db=None,
+        parse_workers: Optional[int] = None,
+        score_concurrency: Optional[int] = None,
+        finder=None,
+    ):
+        """
+        Initialize processor with a shared matcher, optional database and
+        optional near-duplicate finder (enables in-batch and stored-score dedup)
+        """
+        self.matcher = matcher
+        self.db = db
+        self.finder = finder
+        self.parse_workers = max(1, parse_workers or Config.BATCH_PARSE_WORKERS)
+        self.score_concurrency = max(1, score_concurrency or Config.BATCH_SCORE_CONCURRENCY)
+
+    def run(
+        self,
+        job: BatchJob,
+        entries: Iterable[Tuple[str, Union[bytes, OSError, None]]],
+        save: bool = False,
+        include_recommendations: bool = False,
+    ):
+        """
+        Parse and score every entry, updating job progress as it goes
+
+        Entries are pulled lazily; at most ``2 * parse_workers`` are held in
+        memory waiting for a parser, and at most ``score_concurrency`` Gemini
+        calls are in flight at once.
+        """
+        job.status = "running"
+        max_pending = self.parse_workers * 2
+        with_signature = self.finder is not None
+
+        # Signatures of entries already queued in this batch
+        in_batch = _InBatchDuplicates(self.finder.threshold, self.finder.hasher.num_perm) if with_signature else None
+
+        stop_heartbeat = threading.Event()
+        if job.checkpointer is not None:
+            threading.Thread(
+                target=job.checkpointer.heartbeat,
+                args=(stop_heartbeat,),
+                name=f"batch-{job.id}-heartbeat",
+                daemon=True,
+            ).start()
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as parse_pool, ThreadPoolExecutor(max_workers=self.score_concurrency) as score_pool:
+                parsing = set()
+                scoring = []
+
+                for name, data in entries:
+                    job.add_entry()
+                    parsing.add(parse_pool.submit(_parse_entry, name, data, with_signature))
+
+                    if len(parsing) >= max_pending:
+                        done, parsing = wait(parsing, return_when=FIRST_COMPLETED)
+                        scoring.extend(self._enqueue(
+                            job, done, score_pool, save, include_recommendations, in_batch
+                        ))
+
+                done, _ = wait(parsing)
+                scoring.extend(self._enqueue(
+                    job, done, score_pool, save, include_recommendations, in_batch
+                ))
+                wait(scoring)
+
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            stop_heartbeat.set()
+
+    def start(
+        self,
+        job: BatchJob,
+        archive: BinaryIO,
+        save: bool = False,
+        include_recommendations: bool = False,
+    ) -> threading.Thread:
+        """
+        Process a ZIP archive in a background thread, closing it when done
+
+        For a persisted job (``job.run_id``), outstanding outcomes are flushed
+        and the run's final status is recorded when processing ends.
+        """
+        def target():
+            try:
+                self.run(job, iter_archive(archive), save, include_recommendations)
+            finally:
+                archive.close()
+                if self.db is not None:
+                    if job.checkpointer is not None:
+                        job.checkpointer.flush()
+                    if job.run_id is not None:
+                        if getattr(self.matcher, "stats", None) is not None:
+                            save_run_stats(self.db, job.run_id, self.matcher.stats)
+                        self.db.set_run_status(job.run_id, job.status, error=job.error)
+                    self.db.remove_session()
+
+        thread = threading.Thread(target=target, name=f"batch-{job.id}", daemon=True)
+        thread.start()
+        return thread
+
+    def _enqueue(
+        self, job, parsed_futures, score_pool, save, include_recommendations, in_batch
+    ) -> List:
+        """Submit successfully parsed entries for scoring; in-batch near-duplicates wait on their original"""
+        futures = []
+        for future in parsed_futures:
+            entry = future.result()
+            if entry["error"]:
+                job.add_failure(entry["name"], entry["error"])
+                continue
+
+            job.mark_parsed()
+
+            name, text, signature = entry["name"], entry["text"], entry["signature"]
+            if in_batch is not None:
+                duplicate = in_batch.find(signature)
+                if duplicate:
+                    original, similarity = duplicate
+                    settled, result = in_batch.defer(original, (name, text, signature, similarity))
+                    if not settled:
+                        continue
+                    if result is not None:
+                        job.add_duplicate(name, original, similarity, result)
+                        continue
+                    # The original failed; this entry is scored in its place
+                in_batch.add(name, signature)
+
+            futures.append(score_pool.submit(
+                self._score_and_settle, job, name, text, signature, save, include_recommendations, in_batch
+            ))
+        return futures
+
+    def _score_and_settle(
+        self, job, name, resume_text, signature, save, include_recommendations, in_batch
+    ):
+        """Score an entry, then settle the in-batch duplicates waiting on it"""
+        while True:
+            result = self._score_entry(job, name, resume_text, signature, save, include_recommendations)
+            if in_batch is None:
+                return
+
+            waiting = in_batch.resolve(name, result)
+            if result is not None:
+                for duplicate, _, _, similarity in waiting:
+                    job.add_duplicate(duplicate, name, similarity, result)
+                return
+            if not waiting:
+                return
+
+            # The original failed: score its first duplicate instead; the rest wait on that one
+            (name, resume_text, signature, _), rest = waiting[0], waiting[1:]
+            for other in rest:
+                in_batch.defer(name, other)
+
+    def _score_entry(
+        self,
+        job,
+        name: str,
+        resume_text: str,
+        signature: Optional[Tuple[int, ...]],
+        save: bool,
+        include_recommendations: bool,
+    ):
+        """
+        Score one parsed resume (or reuse a stored near-duplicate) and record the outcome
+
+        Returns:
+            The recorded result, or None if scoring failed
+        """
+        try:
+            duplicate = None
+            if self.finder is not None:
+                duplicate = self.finder.find_match(resume_text, job.jd_text, signature)
+
+            if duplicate and Config.NEAR_DUP_MODE == "reuse":
+                record, similarity = duplicate
+                entry = dict(
+                    record.to_dict(),
+                    name=name,
+                    near_duplicate_of=record.id,
+                    similarity=round(similarity, 3),
+                    reused=True,
+                )
+                job.add_result(entry)
+                return entry
+
+            result = self.matcher.match(
+                resume_text, job.jd_text, include_recommendations=include_recommendations
+            )
+
+            entry = {
+                "name": name,
+                "score": result["score"],
+                "explanation": result["explanation"],
+                "recommendations": result.get("recommendations", []),
+            }
+
+            if duplicate:
+                record, similarity = duplicate
+                entry["near_duplicate_of"] = record.id
+                entry["similarity"] = round(similarity, 3)
+
+            if save and self.db is not None:
+                record = self.db.save_match(
+                    resume_text=resume_text,
+                    jd_text=job.jd_text,
+                    score=result["score"],
+                    explanation=result["explanation"],
+                    recommendations=result.get("recommendations", []),
+                )
+                entry["id"] = record.id
+
+                if self.finder is not None:
+                    self.finder.record(record.id, resume_text, job.jd_text, signature)
+
+            job.add_result(entry)
+            return entry
+        except Exception as e:
+            job.add_failure(name, str(e))
+            return None
+        finally:
+            if self.db is not None:
+                self.db.remove_session()
@@ -0,0 +1,108 @@
+"""
+Cascade Module
+Tier bookkeeping for the cheap-model-first scoring cascade
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from config import Config
+
+
+class CascadeStats:
+    """
+    Thread-safe counters for the scoring cascade
+
+    Records call counts and latency per tier for every model call (scoring
+    and recommendations; without the cascade all calls are "strong"), how
+    often the fast tier's score fell inside the uncertainty band and was
+    escalated, and how often the strong tier agreed with the fast tier's
+    hire/no-hire decision.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, band: Optional[float] = None):
+        """Initialize counters for a hiring threshold and uncertainty band"""
+        self.threshold = Config.CASCADE_THRESHOLD if threshold is None else threshold
+        self.band = Config.CASCADE_BAND if band is None else band
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters"""
+        with self._lock:
+            self._calls = {"fast": 0, "strong": 0}
+            self._latency = {"fast": 0.0, "strong": 0.0}
+            self._scored = 0
+            self._escalated = 0
+            self._agreed = 0
+            self._score_delta = 0.0
+
+    def in_band(self, score: float) -> bool:
+        """Whether a score is too close to the threshold to trust the fast tier"""
+        return abs(score - self.threshold) <= self.band
+
+    def record_call(self, tier: str, latency: float):
+        """Record one model call and its latency in seconds"""
+        with self._lock:
+            self._calls[tier] += 1
+            self._latency[tier] += latency
+
+    def record_decision(self, fast_score: float, strong_score: Optional[float] = None):
+        """Record a cascade outcome; ``strong_score`` is set when escalated"""
+        with self._lock:
+            self._scored += 1
+            if strong_score is None:
+                return
+            self._escalated += 1
+            self._score_delta += abs(strong_score - fast_score)
+            if (fast_score >= self.threshold) == (strong_score >= self.threshold):
+                self._agreed += 1
+
+    def state(self) -> Dict[str, Any]:
+        """Raw counters, suitable for persisting and later ``add_state``"""
+        with self._lock:
+            return {
+                "calls": dict(self._calls),
+                "latency": dict(self._latency),
+                "scored": self._scored,
+                "escalated": self._escalated,
+                "agreed": self._agreed,
+                "score_delta": self._score_delta,
+            }
+
+    def add_state(self, state: Dict[str, Any]):
+        """Add counters saved with ``state`` (e.g. from an earlier session of a run)"""
+        if not state:
+            return
+        with self._lock:
+            for tier in ("fast", "strong"):
+                self._calls[tier] += state["calls"].get(tier, 0)
+                self._latency[tier] += state["latency"].get(tier, 0.0)
+            self._scored += state["scored"]
+            self._escalated += state["escalated"]
+            self._agreed += state["agreed"]
+            self._score_delta += state["score_delta"]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert counters to dictionary"""
+        with self._lock:
+            return {
+                "threshold": self.threshold,
+                "band": self.band,
+                "scored": self._scored,
+                "escalated": self._escalated,
+                "escalation_rate": round(self._escalated / self._scored, 3) if self._scored else 0,
+                "agreement_rate": round(self._agreed / self._escalated, 3) if self._escalated else None,
+                "mean_score_delta": round(self._score_delta / self._escalated, 1) if self._escalated else None,
+                "tiers": {
+                    tier: {
+                        "calls": self._calls[tier],
+                        "avg_latency_ms": round(self._latency[tier] / self._calls[tier] * 1000) if self._calls[tier] else 0,
+                    }
+                    for tier in ("fast", "strong")
+                },
+            }
+
+
+# Shared by every Matcher in the process
+cascade_stats = CascadeStats()
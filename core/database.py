@@ -3,11 +3,16 @@ Database Module
 Handles persistence of resume-JD matches and scores
 """
 
-from datetime import datetime
-from typing import List, Optional, Dict, Any
-from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple
+from sqlalchemy import (
+    create_engine, func, insert, or_, select, update, Column, String, Integer, Float, DateTime, LargeBinary, UniqueConstraint,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import scoped_session, sessionmaker, Session
 import json
 
 from config import Config
@@ -30,24 +35,190 @@ class MatchRecord(Base):
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert record to dictionary"""
+        return self.to_data().to_dict()
+    
+    def to_data(self) -> "MatchData":
+        """Copy record into a detached, session-independent DTO"""
+        return MatchData(
+            id=self.id,
+            resume_text=self.resume_text,
+            jd_text=self.jd_text,
+            score=self.score,
+            explanation=self.explanation,
+            recommendations=json.loads(self.recommendations) if self.recommendations else [],
+            timestamp=self.timestamp,
+        )
+
+
+@dataclass(frozen=True)
+class MatchData:
+    """Plain match data returned by ``Database`` (safe to use after the session ends)"""
+    
+    id: int
+    resume_text: str
+    jd_text: str
+    score: float
+    explanation: str
+    recommendations: List[str] = field(default_factory=list)
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert match to dictionary"""
         return {
             "id": self.id,
             "score": self.score,
             "explanation": self.explanation,
-            "recommendations": json.loads(self.recommendations) if self.recommendations else [],
+            "recommendations": list(self.recommendations),
             "timestamp": self.timestamp.isoformat(),
         }
 
 
+class ChangeCounter(Base):
+    """Monotonic version of a table, bumped on every write (drives HTTP ETags)"""
+    
+    __tablename__ = "change_counters"
+    
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class ResumeSignature(Base):
+    """MinHash signature of a stored match's resume, keyed by JD hash"""
+    
+    __tablename__ = "resume_signatures"
+    
+    match_id = Column(Integer, primary_key=True)
+    jd_hash = Column(String, nullable=False, index=True)
+    signature = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+class BatchRun(Base):
+    """A persisted batch screening run"""
+    
+    __tablename__ = "batch_runs"
+    
+    id = Column(Integer, primary_key=True)
+    source = Column(String, nullable=False)
+    jd_text = Column(String, nullable=False)
+    options = Column(String, nullable=True)  # JSON string
+    status = Column(String, nullable=False, default="running")
+    error = Column(String, nullable=True)
+    stats = Column(String, nullable=True)  # JSON string (model call counters)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class BatchItem(Base):
+    """Status of one resume within a batch run"""
+    
+    __tablename__ = "batch_items"
+    __table_args__ = (UniqueConstraint("run_id", "name"),)
+    
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, nullable=False, index=True)
+    name = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending/completed/duplicate/failed
+    duplicate_of = Column(String, nullable=True)  # name of the in-batch original
+    near_duplicate_of = Column(Integer, nullable=True)  # stored match it resembles (reused in "reuse" mode)
+    similarity = Column(Float, nullable=True)
+    score = Column(Float, nullable=True)
+    explanation = Column(String, nullable=True)
+    recommendations = Column(String, nullable=True)  # JSON string
+    match_id = Column(Integer, nullable=True)
+    error = Column(String, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class WatchResult(Base):
+    """Outcome of scoring one watched resume (by content) against one JD"""
+    
+    __tablename__ = "watch_results"
+    __table_args__ = (UniqueConstraint("content_hash", "jd_hash"),)
+    
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String, nullable=False, index=True)
+    jd_hash = Column(String, nullable=False)
+    path = Column(String, nullable=False)
+    status = Column(String, nullable=False)  # completed/duplicate/failed
+    score = Column(Float, nullable=True)
+    match_id = Column(Integer, nullable=True)
+    error = Column(String, nullable=True)
+    processed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class MatchLock(Base):
+    """Cross-worker lock for an in-flight match computation"""
+    
+    __tablename__ = "match_locks"
+    
+    key = Column(String, primary_key=True)
+    owner = Column(String, nullable=False)
+    acquired_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class MatchResultCache(Base):
+    """Result of a coalesced match, shared with waiting workers"""
+    
+    __tablename__ = "match_results"
+    
+    key = Column(String, primary_key=True)
+    result = Column(String, nullable=False)  # JSON string
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
 class Database:
-    """Database manager for persistence"""
+    """
+    Database manager for persistence
+    
+    Sessions are scoped per thread, so one ``Database`` can be shared by a
+    threaded web server. Every method runs in its own transaction and returns
+    plain data (``MatchData``, dicts, tuples), never live ORM objects.
+    """
     
     def __init__(self, db_url: Optional[str] = None):
         """Initialize database connection"""
         db_url = db_url or Config.DATABASE_URL
-        self.engine = create_engine(db_url)
+        self.engine = create_engine(db_url, **self._engine_options(db_url))
         Base.metadata.create_all(self.engine)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.Session = scoped_session(sessionmaker(bind=self.engine, expire_on_commit=False))
+        self._ensure_counter("matches")
+    
+    @staticmethod
+    def _engine_options(db_url: str) -> Dict[str, Any]:
+        """Connection pool settings from config"""
+        options: Dict[str, Any] = {"pool_pre_ping": True}
+        
+        if db_url.startswith("sqlite"):
+            # Connections are handed between threads by the pool
+            options["connect_args"] = {"check_same_thread": False}
+            if db_url in ("sqlite://", "sqlite:///:memory:"):
+                # In-memory databases use a single-connection pool
+                return options
+        
+        options.update(
+            pool_size=Config.DB_POOL_SIZE,
+            max_overflow=Config.DB_MAX_OVERFLOW,
+            pool_timeout=Config.DB_POOL_TIMEOUT,
+            pool_recycle=Config.DB_POOL_RECYCLE,
+        )
+        return options
+    
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Run a unit of work in the current thread's session"""
+        session = self.Session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+    
+    def remove_session(self):
+        """Discard the current thread's session (call at request/thread end)"""
+        self.Session.remove()
     
     def save_match(
         self,
@@ -56,10 +227,9 @@ class Database:
         score: float,
         explanation: str,
         recommendations: Optional[List[str]] = None,
-    ) -> MatchRecord:
+    ) -> MatchData:
         """Save a resume-JD match to database"""
-        session = self.SessionLocal()
-        try:
+        with self.session_scope() as session:
             record = MatchRecord(
                 resume_text=resume_text,
                 jd_text=jd_text,
@@ -69,24 +239,19 @@ class Database:
                 timestamp=datetime.utcnow(),
             )
             session.add(record)
-            session.commit()
-            session.refresh(record)
-            return record
-        finally:
-            session.close()
+            session.flush()
+            self._bump_version(session)
+            return record.to_data()
     
-    def get_match(self, match_id: int) -> Optional[MatchRecord]:
+    def get_match(self, match_id: int) -> Optional[MatchData]:
         """Retrieve a specific match by ID"""
-        session = self.SessionLocal()
-        try:
-            return session.query(MatchRecord).filter(MatchRecord.id == match_id).first()
-        finally:
-            session.close()
+        with self.session_scope() as session:
+            record = session.get(MatchRecord, match_id)
+            return record.to_data() if record else None
     
-    def list_matches(self, limit: int = 100, order_by: str = "score") -> List[MatchRecord]:
+    def list_matches(self, limit: int = 100, order_by: str = "score") -> List[MatchData]:
         """List all matches, optionally ordered"""
-        session = self.SessionLocal()
-        try:
+        with self.session_scope() as session:
             query = session.query(MatchRecord)
             
             if order_by == "score":
@@ -94,37 +259,363 @@ class Database:
             elif order_by == "recent":
                 query = query.order_by(MatchRecord.timestamp.desc())
             
-            return query.limit(limit).all()
-        finally:
-            session.close()
+            return [record.to_data() for record in query.limit(limit).all()]
+    
+    def iter_matches(self, chunk_size: int = 1000) -> Iterator[MatchData]:
+        """
+        Stream all matches in ID order in constant memory
+        
+        Rows are fetched ``chunk_size`` at a time with ``yield_per``, which uses a
+        server-side cursor on backends that support one (e.g. PostgreSQL).
+        """
+        with self.session_scope() as session:
+            result = session.execute(
+                select(MatchRecord)
+                .order_by(MatchRecord.id)
+                .execution_options(yield_per=chunk_size)
+            )
+            for partition in result.scalars().partitions():
+                # The identity map holds rows weakly, so each chunk is freed once converted
+                for record in partition:
+                    yield record.to_data()
+    
+    def bulk_import_matches(self, rows: Iterable[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """
+        Insert matches in batches within a single transaction
+        
+        The import is all-or-nothing: if ``rows`` raises (e.g. on a malformed
+        row) or an insert fails, nothing is committed.
+        
+        Args:
+            rows: ``MatchRecord`` column values (see ``core.export.iter_import``)
+            batch_size: Rows per executemany INSERT
+            
+        Returns:
+            Number of rows inserted
+        """
+        total = 0
+        batch: List[Dict[str, Any]] = []
+        
+        with self.session_scope() as session:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    session.execute(insert(MatchRecord), batch)
+                    total += len(batch)
+                    batch = []
+            
+            if batch:
+                session.execute(insert(MatchRecord), batch)
+                total += len(batch)
+            
+            if total:
+                self._bump_version(session)
+        
+        return total
     
     def delete_match(self, match_id: int) -> bool:
         """Delete a match by ID"""
-        session = self.SessionLocal()
-        try:
-            record = session.query(MatchRecord).filter(MatchRecord.id == match_id).first()
+        with self.session_scope() as session:
+            record = session.get(MatchRecord, match_id)
             if record:
                 session.delete(record)
-                session.commit()
+                session.query(ResumeSignature).filter(ResumeSignature.match_id == match_id).delete()
+                self._bump_version(session)
                 return True
             return False
+    
+    def get_version(self, name: str = "matches") -> Tuple[int, datetime]:
+        """
+        Current (version, last change time) of a table
+        
+        A single primary-key lookup, cheap enough to run on every poll.
+        """
+        with self.session_scope() as session:
+            counter = session.get(ChangeCounter, name)
+            if counter is None:
+                return 0, datetime(1970, 1, 1)
+            return counter.version, counter.updated_at
+    
+    def _ensure_counter(self, name: str):
+        """Create a change counter row if missing (tolerates concurrent workers)"""
+        try:
+            with self.session_scope() as session:
+                if session.get(ChangeCounter, name) is None:
+                    session.add(ChangeCounter(name=name, version=0, updated_at=datetime.utcnow()))
+        except IntegrityError:
+            pass
         finally:
-            session.close()
+            self.remove_session()
+    
+    @staticmethod
+    def _bump_version(session: Session, name: str = "matches"):
+        """Increment a change counter inside the caller's transaction"""
+        session.query(ChangeCounter).filter(ChangeCounter.name == name).update(
+            {ChangeCounter.version: ChangeCounter.version + 1, ChangeCounter.updated_at: datetime.utcnow()}
+        )
+    
+    def save_signature(self, match_id: int, jd_hash: str, signature: bytes):
+        """Store the MinHash signature of a match's resume"""
+        with self.session_scope() as session:
+            session.merge(ResumeSignature(
+                match_id=match_id, jd_hash=jd_hash, signature=signature, created_at=datetime.utcnow()
+            ))
+    
+    def list_signatures(self, after_id: int = 0, since: Optional[datetime] = None) -> List[Tuple[int, str, bytes]]:
+        """
+        List (match_id, jd_hash, signature) rows with match_id above ``after_id``
+        
+        With ``since``, rows saved at or after that time are included too, so
+        signatures committed out of match_id order are not skipped.
+        """
+        with self.session_scope() as session:
+            condition = ResumeSignature.match_id > after_id
+            if since is not None:
+                condition = or_(condition, ResumeSignature.created_at >= since)
+            rows = (
+                session.query(ResumeSignature.match_id, ResumeSignature.jd_hash, ResumeSignature.signature)
+                .filter(condition)
+                .order_by(ResumeSignature.match_id)
+                .all()
+            )
+            return [tuple(row) for row in rows]
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about stored matches"""
-        session = self.SessionLocal()
-        try:
+        with self.session_scope() as session:
             count = session.query(MatchRecord).count()
             if count == 0:
                 return {"total": 0, "average_score": 0}
             
-            from sqlalchemy import func
             avg_score = session.query(func.avg(MatchRecord.score)).scalar() or 0
             
             return {
                 "total": count,
                 "average_score": round(avg_score, 1),
             }
-        finally:
-            session.close()
+    
+    def create_run(
+        self,
+        source: str,
+        jd_text: str,
+        names: List[str],
+        options: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Create a batch run with every item pending; returns the run ID
+        
+        Repeated names (e.g. duplicate archive entries) share one item.
+        """
+        names = list(dict.fromkeys(names))
+        with self.session_scope() as session:
+            run = BatchRun(
+                source=source,
+                jd_text=jd_text,
+                options=json.dumps(options or {}),
+                status="running",
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow(),
+            )
+            session.add(run)
+            session.flush()
+            
+            now = datetime.utcnow()
+            for start in range(0, len(names), chunk_size):
+                session.execute(insert(BatchItem), [
+                    {"run_id": run.id, "name": name, "status": "pending", "updated_at": now}
+                    for name in names[start:start + chunk_size]
+                ])
+            return run.id
+    
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Retrieve a batch run with per-status item counts"""
+        with self.session_scope() as session:
+            run = session.get(BatchRun, run_id)
+            if not run:
+                return None
+            
+            counts = dict(
+                session.query(BatchItem.status, func.count(BatchItem.id))
+                .filter(BatchItem.run_id == run_id)
+                .group_by(BatchItem.status)
+                .all()
+            )
+            
+            return {
+                "id": run.id,
+                "source": run.source,
+                "jd_text": run.jd_text,
+                "options": json.loads(run.options) if run.options else {},
+                "status": run.status,
+                "error": run.error,
+                "stats": json.loads(run.stats) if run.stats else {},
+                "created_at": run.created_at.isoformat(),
+                "updated_at": run.updated_at.isoformat(),
+                "counts": counts,
+            }
+    
+    def list_run_items(self, run_id: int, statuses: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """List items of a batch run, optionally filtered by status"""
+        with self.session_scope() as session:
+            query = session.query(BatchItem).filter(BatchItem.run_id == run_id)
+            if statuses:
+                query = query.filter(BatchItem.status.in_(statuses))
+            
+            return [
+                {
+                    "id": item.id,
+                    "name": item.name,
+                    "status": item.status,
+                    "duplicate_of": item.duplicate_of,
+                    "near_duplicate_of": item.near_duplicate_of,
+                    "similarity": item.similarity,
+                    "score": item.score,
+                    "explanation": item.explanation,
+                    "recommendations": json.loads(item.recommendations) if item.recommendations else [],
+                    "match_id": item.match_id,
+                    "error": item.error,
+                }
+                for item in query.order_by(BatchItem.id).all()
+            ]
+    
+    def update_run_items(self, updates: List[Dict[str, Any]], run_id: Optional[int] = None):
+        """
+        Bulk-update batch items in one transaction
+        
+        Each dict must contain the item ``id`` plus the columns to change.
+        With ``run_id``, the run's ``updated_at`` heartbeat is refreshed in
+        the same transaction (even if there are no item updates).
+        """
+        if not updates and run_id is None:
+            return
+        
+        with self.session_scope() as session:
+            if updates:
+                session.execute(update(BatchItem), updates)
+            if run_id is not None:
+                session.query(BatchRun).filter(BatchRun.id == run_id).update(
+                    {"updated_at": datetime.utcnow()}
+                )
+    
+    def set_run_status(self, run_id: int, status: str, error: Optional[str] = None):
+        """Update the status (and failure reason) of a batch run"""
+        with self.session_scope() as session:
+            session.query(BatchRun).filter(BatchRun.id == run_id).update(
+                {"status": status, "error": error, "updated_at": datetime.utcnow()}
+            )
+    
+    def set_run_stats(self, run_id: int, stats: Dict[str, Any]):
+        """Store a batch run's model call counters"""
+        with self.session_scope() as session:
+            session.query(BatchRun).filter(BatchRun.id == run_id).update({"stats": json.dumps(stats)})
+    
+    def purge_runs(self, source_prefix: str, max_age: timedelta) -> int:
+        """
+        Delete batch runs (and their items) from a source older than ``max_age``
+        
+        Returns:
+            Number of runs deleted
+        """
+        cutoff = datetime.utcnow() - max_age
+        with self.session_scope() as session:
+            run_ids = [
+                run_id for (run_id,) in session.query(BatchRun.id).filter(
+                    BatchRun.source.startswith(source_prefix, autoescape=True),
+                    BatchRun.created_at < cutoff,
+                )
+            ]
+            if run_ids:
+                session.query(BatchItem).filter(BatchItem.run_id.in_(run_ids)).delete(synchronize_session=False)
+                session.query(BatchRun).filter(BatchRun.id.in_(run_ids)).delete(synchronize_session=False)
+            return len(run_ids)
+    
+    def get_watched_jds(self, content_hash: str) -> List[str]:
+        """JD hashes a watched resume's content has already been handled against"""
+        with self.session_scope() as session:
+            rows = session.query(WatchResult.jd_hash).filter(WatchResult.content_hash == content_hash)
+            return [jd_hash for (jd_hash,) in rows]
+    
+    def record_watch_result(
+        self,
+        content_hash: str,
+        jd_hash: str,
+        path: str,
+        status: str,
+        score: Optional[float] = None,
+        match_id: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        """
+        Record a watched resume's outcome for one JD
+        
+        Returns:
+            False if the same content was already recorded for this JD
+        """
+        try:
+            with self.session_scope() as session:
+                session.add(WatchResult(
+                    content_hash=content_hash,
+                    jd_hash=jd_hash,
+                    path=path,
+                    status=status,
+                    score=score,
+                    match_id=match_id,
+                    error=error,
+                    processed_at=datetime.utcnow(),
+                ))
+            return True
+        except IntegrityError:
+            return False
+    
+    def try_acquire_lock(self, key: str, owner: str, ttl: float) -> bool:
+        """
+        Try to take the cross-worker lock for a request key
+        
+        Locks older than ``ttl`` seconds are treated as abandoned and taken over.
+        """
+        try:
+            with self.session_scope() as session:
+                stale_before = datetime.utcnow() - timedelta(seconds=ttl)
+                session.query(MatchLock).filter(
+                    MatchLock.key == key,
+                    MatchLock.acquired_at < stale_before,
+                ).delete()
+                session.add(MatchLock(key=key, owner=owner, acquired_at=datetime.utcnow()))
+            return True
+        except IntegrityError:
+            return False
+    
+    def release_lock(self, key: str, owner: str):
+        """Release a cross-worker lock held by ``owner``"""
+        with self.session_scope() as session:
+            session.query(MatchLock).filter(
+                MatchLock.key == key,
+                MatchLock.owner == owner,
+            ).delete()
+    
+    def is_locked(self, key: str) -> bool:
+        """Check whether another worker holds the lock for a request key"""
+        with self.session_scope() as session:
+            return session.query(MatchLock).filter(MatchLock.key == key).first() is not None
+    
+    def store_result(self, key: str, result: Dict[str, Any], ttl: float):
+        """Publish a coalesced result and drop results older than ``ttl`` seconds"""
+        with self.session_scope() as session:
+            session.query(MatchResultCache).filter(
+                MatchResultCache.created_at < datetime.utcnow() - timedelta(seconds=ttl)
+            ).delete()
+            session.merge(MatchResultCache(
+                key=key,
+                result=json.dumps(result),
+                created_at=datetime.utcnow(),
+            ))
+    
+    def get_result(self, key: str, ttl: float) -> Optional[Dict[str, Any]]:
+        """Fetch a coalesced result published within the last ``ttl`` seconds"""
+        with self.session_scope() as session:
+            record = session.query(MatchResultCache).filter(
+                MatchResultCache.key == key,
+                MatchResultCache.created_at >= datetime.utcnow() - timedelta(seconds=ttl),
+            ).first()
+            return json.loads(record.result) if record else None
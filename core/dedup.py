@@ -0,0 +1,221 @@
+"""
+Near-Duplicate Module
+MinHash signatures and LSH lookup for resumes resubmitted with trivial edits
+"""
+
+import hashlib
+import random
+import re
+import struct
+import threading
+from array import array
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import Config
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_PATTERN = re.compile(r"[a-z]+|\d+")
+# Signatures are saved in their own transaction after the match, so a lower
+# match_id can commit after a higher one; recent rows are re-read this far back
+_COMMIT_GRACE = timedelta(seconds=60)
+
+
+def normalized_hash(text: str) -> str:
+    """Hash text with case and whitespace normalized (used to key JDs)"""
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """
+    Split text into overlapping word shingles
+
+    Numbers are collapsed to a placeholder so edited dates and phone
+    numbers do not change the shingle set.
+    """
+    tokens = ["#" if t.isdigit() else t for t in _TOKEN_PATTERN.findall(text.lower())]
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+class MinHasher:
+    """Compute MinHash signatures whose agreement estimates Jaccard similarity"""
+
+    def __init__(self, num_perm: Optional[int] = None, seed: int = 1):
+        """Initialize fixed permutations so signatures are comparable across runs"""
+        self.num_perm = num_perm or Config.MINHASH_NUM_PERM
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(self.num_perm)
+        ]
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a text"""
+        hashes = [
+            struct.unpack("<Q", hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest())[0]
+            for s in shingles(text)
+        ]
+        if not hashes:
+            return tuple([_MAX_HASH] * self.num_perm)
+
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        )
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimate Jaccard similarity from two signatures"""
+        if not sig_a or len(sig_a) != len(sig_b):
+            return 0.0
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    @staticmethod
+    def to_bytes(signature: Tuple[int, ...]) -> bytes:
+        """Pack a signature for storage"""
+        return array("I", signature).tobytes()
+
+    @staticmethod
+    def from_bytes(data: bytes) -> Tuple[int, ...]:
+        """Unpack a stored signature"""
+        values = array("I")
+        values.frombytes(data)
+        return tuple(values)
+
+
+class LSHIndex:
+    """
+    Banded locality-sensitive hash index over MinHash signatures
+
+    Signatures are split into ``bands`` of ``rows``; two items become
+    candidates when any band matches exactly. Band layout is chosen so the
+    S-curve threshold ``(1/bands) ** (1/rows)`` sits at the Jaccard threshold.
+    """
+
+    def __init__(self, threshold: float, num_perm: int):
+        """Initialize empty index tuned for ``threshold``"""
+        self.threshold = threshold
+        self.bands, self.rows = self._choose_bands(threshold, num_perm)
+        self._buckets: Dict[Tuple, List] = defaultdict(list)
+
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """Pick (bands, rows) whose S-curve inflection is closest to threshold"""
+        options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+        return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+    def insert(self, key, signature: Tuple[int, ...], namespace: str = ""):
+        """Add an item to the index"""
+        for band in range(self.bands):
+            self._buckets[self._bucket(signature, band, namespace)].append(key)
+
+    def query(self, signature: Tuple[int, ...], namespace: str = "") -> Set:
+        """Return keys sharing at least one band with the signature"""
+        candidates = set()
+        for band in range(self.bands):
+            candidates.update(self._buckets.get(self._bucket(signature, band, namespace), ()))
+        return candidates
+
+    def _bucket(self, signature: Tuple[int, ...], band: int, namespace: str) -> Tuple:
+        """Bucket key for one band of a signature"""
+        start = band * self.rows
+        return (namespace, band, signature[start:start + self.rows])
+
+
+class NearDuplicateFinder:
+    """
+    Find stored matches for near-identical resumes against the same JD
+
+    Signatures are persisted per match in the database; each process keeps an
+    in-memory LSH index and incrementally loads signatures saved by others.
+    """
+
+    def __init__(self, db, threshold: Optional[float] = None, num_perm: Optional[int] = None):
+        """Initialize finder backed by ``db``"""
+        self.db = db
+        self.threshold = Config.NEAR_DUP_THRESHOLD if threshold is None else threshold
+        self.hasher = MinHasher(num_perm)
+        self.index = LSHIndex(self.threshold, self.hasher.num_perm)
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self._last_loaded_id = 0
+        self._last_refresh: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def find(
+        self,
+        resume_text: str,
+        jd_text: str,
+        signature: Optional[Tuple[int, ...]] = None,
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Look up the most similar stored match for the same JD
+
+        Returns:
+            Tuple of (match_id, estimated similarity) or None
+        """
+        signature = signature or self.hasher.signature(resume_text)
+        jd_key = normalized_hash(jd_text)
+
+        with self._lock:
+            self._refresh()
+            best = None
+            for match_id in self.index.query(signature, namespace=jd_key):
+                similarity = MinHasher.similarity(signature, self._signatures[match_id])
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (match_id, similarity)
+            return best
+
+    def find_match(
+        self,
+        resume_text: str,
+        jd_text: str,
+        signature: Optional[Tuple[int, ...]] = None,
+    ):
+        """
+        Fetch the stored match record for the closest near-duplicate
+
+        Returns:
+            Tuple of (match record, estimated similarity) or None
+        """
+        found = self.find(resume_text, jd_text, signature)
+        if not found:
+            return None
+
+        match_id, similarity = found
+        record = self.db.get_match(match_id)
+        return (record, similarity) if record else None
+
+    def record(
+        self,
+        match_id: int,
+        resume_text: str,
+        jd_text: str,
+        signature: Optional[Tuple[int, ...]] = None,
+    ):
+        """Persist the signature of a saved match and index it"""
+        signature = signature or self.hasher.signature(resume_text)
+        jd_key = normalized_hash(jd_text)
+        self.db.save_signature(match_id, jd_key, MinHasher.to_bytes(signature))
+
+        with self._lock:
+            self._add(match_id, jd_key, signature)
+
+    def _refresh(self):
+        """Load signatures persisted since the last refresh"""
+        started = datetime.utcnow()
+        since = self._last_refresh - _COMMIT_GRACE if self._last_refresh else None
+        for match_id, jd_key, data in self.db.list_signatures(after_id=self._last_loaded_id, since=since):
+            self._add(match_id, jd_key, MinHasher.from_bytes(data))
+            self._last_loaded_id = max(self._last_loaded_id, match_id)
+        self._last_refresh = started
+
+    def _add(self, match_id: int, jd_key: str, signature: Tuple[int, ...]):
+        """Insert into the in-memory index once"""
+        if match_id not in self._signatures:
+            self._signatures[match_id] = signature
+            self.index.insert(match_id, signature, namespace=jd_key)
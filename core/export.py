@@ -0,0 +1,112 @@
+"""
+Export Module
+Streaming CSV/JSONL serialization of match history for export and import
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, TextIO
+
+from core.database import MatchData
+
+FORMATS = {"csv", "jsonl"}
+FIELDS = ["id", "timestamp", "score", "explanation", "recommendations", "resume_text", "jd_text"]
+
+
+def detect_format(path: str, default: str = "csv") -> str:
+    """Infer export format from a file extension"""
+    if path.endswith(".jsonl") or path.endswith(".ndjson"):
+        return "jsonl"
+    if path.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def _to_row(match: MatchData) -> Dict[str, Any]:
+    """Flatten a match for export"""
+    return {
+        "id": match.id,
+        "timestamp": match.timestamp.isoformat(),
+        "score": match.score,
+        "explanation": match.explanation,
+        "recommendations": list(match.recommendations),
+        "resume_text": match.resume_text,
+        "jd_text": match.jd_text,
+    }
+
+
+def iter_export(matches: Iterable[MatchData], fmt: str, rows_per_chunk: int = 500) -> Iterator[str]:
+    """
+    Serialize matches as text chunks in constant memory
+
+    Args:
+        matches: Matches to export (typically ``Database.iter_matches()``)
+        fmt: "csv" or "jsonl"
+        rows_per_chunk: Rows buffered before a chunk is yielded
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS) if fmt == "csv" else None
+    if writer:
+        writer.writeheader()
+
+    rows = 0
+    for match in matches:
+        row = _to_row(match)
+        if writer:
+            row["recommendations"] = json.dumps(row["recommendations"])
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row) + "\n")
+
+        rows += 1
+        if rows % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_import(stream: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """
+    Parse exported rows into ``MatchRecord`` column values, one at a time
+
+    IDs are not carried over; imported rows get new IDs.
+
+    Raises:
+        ValueError: On unsupported format or a malformed row
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    if fmt == "csv":
+        rows = enumerate(csv.DictReader(stream), 1)
+    else:
+        rows = ((line_no, line) for line_no, line in enumerate(stream, 1) if line.strip())
+
+    for line_no, row in rows:
+        try:
+            if fmt == "jsonl":
+                row = json.loads(row)
+
+            recommendations = row.get("recommendations") or []
+            if isinstance(recommendations, str):
+                recommendations = json.loads(recommendations)
+
+            timestamp = row.get("timestamp")
+            yield {
+                "resume_text": row["resume_text"],
+                "jd_text": row["jd_text"],
+                "score": float(row["score"]),
+                "explanation": row["explanation"],
+                "recommendations": json.dumps(recommendations),
+                "timestamp": datetime.fromisoformat(timestamp) if timestamp else datetime.utcnow(),
+            }
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid row {line_no}: {e}")
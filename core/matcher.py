@@ -5,26 +5,41 @@ Core matching logic using Google Gemini AI
 
 import json
 import re
-from typing import Dict, Any, List, Tuple
+import time
+from typing import Dict, Any, List, Optional, Tuple
 import google.generativeai as genai
 
 from config import Config
 from core.resume_parser import ResumeParser
 from core.jd_parser import JDParser
+from core.cascade import CascadeStats, cascade_stats
 
 
 class Matcher:
     """AI-powered resume-JD matcher using Google Gemini"""
     
-    def __init__(self, api_key: str = ""):
-        """Initialize matcher with Google Gemini API"""
+    def __init__(self, api_key: str = "", cascade: Optional[bool] = None):
+        """
+        Initialize matcher with Google Gemini API
+        
+        With ``cascade`` (default ``Config.CASCADE_ENABLED``), every resume is
+        scored by the fast model first and only scores inside the uncertainty
+        band around ``Config.CASCADE_THRESHOLD`` are re-scored by ``LLM_MODEL``.
+        """
         api_key = api_key or Config.GOOGLE_API_KEY
         if not api_key:
             raise ValueError("GOOGLE_API_KEY not set. Set it in environment or pass as argument.")
         
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(Config.LLM_MODEL)
+        
+        cascade = Config.CASCADE_ENABLED if cascade is None else cascade
+        self.fast_model = genai.GenerativeModel(Config.LLM_MODEL_FAST) if cascade else None
         self.conversation_history = []
+        
+        # Calls made by this matcher (e.g. one CLI run); the process-wide
+        # totals in ``cascade_stats`` are updated as well
+        self.stats = CascadeStats()
     
     def match(
         self,
@@ -44,37 +59,170 @@ class Matcher:
             Dictionary with score, explanation, and optionally recommendations
         """
         # Parse inputs
+        resume_text, jd_text = self._prepare(resume_text, jd_text)
+        
+        # Get score and explanation
+        score, explanation, model = self._cascade_score(resume_text, jd_text)
+        result = self._build_result(resume_text, jd_text, score, explanation)
+        if self.fast_model is not None:
+            result["tier"] = self._tier_name(model)
+        
+        # Get recommendations if requested (from the tier that produced the score)
+        if include_recommendations:
+            recommendations = self._recommend(resume_text, jd_text, score, model)
+            result["recommendations"] = recommendations
+        
+        return result
+    
+    async def match_async(
+        self,
+        resume_text: str,
+        jd_text: str,
+        include_recommendations: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of ``match`` for the ASGI serving mode
+        
+        The Gemini calls are awaited instead of blocking a worker thread, so
+        one event loop can keep many matches in flight.
+        """
+        resume_text, jd_text = self._prepare(resume_text, jd_text)
+        
+        score, explanation, model = await self._cascade_score_async(resume_text, jd_text)
+        result = self._build_result(resume_text, jd_text, score, explanation)
+        if self.fast_model is not None:
+            result["tier"] = self._tier_name(model)
+        
+        if include_recommendations:
+            result["recommendations"] = await self._recommend_async(resume_text, jd_text, score, model)
+        
+        return result
+    
+    def _cascade_score(self, resume_text: str, jd_text: str):
+        """
+        Score with the fast tier, escalating borderline scores to the strong tier
+        
+        Returns:
+            Tuple of (score, explanation, model that produced the final score)
+        """
+        if self.fast_model is None:
+            return (*self._score(resume_text, jd_text), self.model)
+        
+        fast_score, fast_explanation = self._score(resume_text, jd_text, self.fast_model)
+        
+        if not cascade_stats.in_band(fast_score):
+            self._record_decision(fast_score)
+            return fast_score, fast_explanation, self.fast_model
+        
+        score, explanation = self._score(resume_text, jd_text, self.model)
+        self._record_decision(fast_score, score)
+        return score, explanation, self.model
+    
+    async def _cascade_score_async(self, resume_text: str, jd_text: str):
+        """Async variant of ``_cascade_score``"""
+        if self.fast_model is None:
+            return (*await self._score_async(resume_text, jd_text), self.model)
+        
+        fast_score, fast_explanation = await self._score_async(resume_text, jd_text, self.fast_model)
+        
+        if not cascade_stats.in_band(fast_score):
+            self._record_decision(fast_score)
+            return fast_score, fast_explanation, self.fast_model
+        
+        score, explanation = await self._score_async(resume_text, jd_text, self.model)
+        self._record_decision(fast_score, score)
+        return score, explanation, self.model
+    
+    def _tier_name(self, model) -> str:
+        """Name of the cascade tier a model belongs to"""
+        return "fast" if model is self.fast_model else "strong"
+    
+    def _record_call(self, model, started: float):
+        """Count one model call (score or recommendations) and its latency"""
+        latency = time.perf_counter() - started
+        tier = self._tier_name(model)
+        for stats in (cascade_stats, self.stats):
+            stats.record_call(tier, latency)
+    
+    def _record_decision(self, fast_score: float, strong_score: Optional[float] = None):
+        """Record a cascade outcome for this matcher and the process"""
+        for stats in (cascade_stats, self.stats):
+            stats.record_decision(fast_score, strong_score)
+    
+    @staticmethod
+    def validate_inputs(resume_text: str, jd_text: str):
+        """
+        Check inputs against the rules ``match`` applies, without calling the model
+        
+        Raises:
+            ValueError: If ``match`` would reject the resume or JD
+        """
+        Matcher._prepare(resume_text, jd_text)
+    
+    @staticmethod
+    def _prepare(resume_text: str, jd_text: str) -> Tuple[str, str]:
+        """Parse and validate inputs"""
         resume_text = ResumeParser.parse(resume_text)
         ResumeParser.validate(resume_text)
         
         jd_text = JDParser.parse(jd_text)["raw_text"]
         JDParser.validate(jd_text)
         
-        # Get score and explanation
-        score, explanation = self._score(resume_text, jd_text)
-        
-        result = {
+        return resume_text, jd_text
+    
+    @staticmethod
+    def _build_result(resume_text: str, jd_text: str, score: float, explanation: str) -> Dict[str, Any]:
+        """Assemble the match result dictionary"""
+        return {
             "score": score,
             "explanation": explanation,
             "resume_preview": resume_text[:200] + "..." if len(resume_text) > 200 else resume_text,
             "jd_preview": jd_text[:200] + "..." if len(jd_text) > 200 else jd_text,
         }
-        
-        # Get recommendations if requested
-        if include_recommendations:
-            recommendations = self._recommend(resume_text, jd_text, score)
-            result["recommendations"] = recommendations
-        
-        return result
     
-    def _score(self, resume_text: str, jd_text: str) -> Tuple[float, str]:
+    @staticmethod
+    def _generation_config():
+        """Generation settings shared by all prompts"""
+        return genai.types.GenerationConfig(
+            temperature=0.3,
+            top_p=0.95,
+        )
+    
+    def _score(self, resume_text: str, jd_text: str, model=None) -> Tuple[float, str]:
         """
         Score resume against job description using Google Gemini
         
         Returns:
             Tuple of (score, explanation)
         """
-        prompt = f"""You are an expert recruiter and career advisor. Analyze the following resume against the job description and provide a match score and explanation.
+        model = model or self.model
+        started = time.perf_counter()
+        try:
+            response = model.generate_content(
+                self._score_prompt(resume_text, jd_text),
+                generation_config=self._generation_config(),
+            )
+        finally:
+            self._record_call(model, started)
+        return self._parse_score(response.text)
+    
+    async def _score_async(self, resume_text: str, jd_text: str, model=None) -> Tuple[float, str]:
+        """Async variant of ``_score``"""
+        model = model or self.model
+        started = time.perf_counter()
+        try:
+            response = await model.generate_content_async(
+                self._score_prompt(resume_text, jd_text),
+                generation_config=self._generation_config(),
+            )
+        finally:
+            self._record_call(model, started)
+        return self._parse_score(response.text)
+    
+    @staticmethod
+    def _score_prompt(resume_text: str, jd_text: str) -> str:
+        """Build the scoring prompt"""
+        return f"""You are an expert recruiter and career advisor. Analyze the following resume against the job description and provide a match score and explanation.
 
 RESUME:
 {resume_text}
@@ -95,16 +243,11 @@ Focus on:
 4. Cultural/role fit indicators
 
 Respond ONLY with valid JSON, no other text."""
-
-        response = self.model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.3,
-                top_p=0.95,
-            ),
-        )
-        
-        response_text = response.text.strip()
+    
+    @staticmethod
+    def _parse_score(response_text: str) -> Tuple[float, str]:
+        """Parse score and explanation from a scoring response"""
+        response_text = response_text.strip()
         
         # Parse JSON response
         try:
@@ -127,14 +270,43 @@ Respond ONLY with valid JSON, no other text."""
             score = float(score_match.group(1)) if score_match else 50
             return score, "Analysis completed (parsing note: response format adjusted)"
     
-    def _recommend(self, resume_text: str, jd_text: str, current_score: float) -> List[str]:
+    def _recommend(self, resume_text: str, jd_text: str, current_score: float, model=None) -> List[str]:
         """
         Generate recommendations to improve resume match
         
         Returns:
             List of recommendation strings
         """
-        prompt = f"""You are an expert career coach. Given the resume, job description, and current match score of {current_score}/100, provide 3-5 specific, actionable recommendations to improve the match.
+        model = model or self.model
+        started = time.perf_counter()
+        try:
+            response = model.generate_content(
+                self._recommend_prompt(resume_text, jd_text, current_score),
+                generation_config=self._generation_config(),
+            )
+        finally:
+            self._record_call(model, started)
+        return self._parse_recommendations(response.text)
+    
+    async def _recommend_async(
+        self, resume_text: str, jd_text: str, current_score: float, model=None
+    ) -> List[str]:
+        """Async variant of ``_recommend``"""
+        model = model or self.model
+        started = time.perf_counter()
+        try:
+            response = await model.generate_content_async(
+                self._recommend_prompt(resume_text, jd_text, current_score),
+                generation_config=self._generation_config(),
+            )
+        finally:
+            self._record_call(model, started)
+        return self._parse_recommendations(response.text)
+    
+    @staticmethod
+    def _recommend_prompt(resume_text: str, jd_text: str, current_score: float) -> str:
+        """Build the recommendations prompt"""
+        return f"""You are an expert career coach. Given the resume, job description, and current match score of {current_score}/100, provide 3-5 specific, actionable recommendations to improve the match.
 
 RESUME:
 {resume_text[:2000]}
@@ -150,16 +322,11 @@ Provide recommendations as a JSON array of strings. Each recommendation should b
 Format: {{"recommendations": ["rec1", "rec2", ...]}}
 
 Respond ONLY with valid JSON."""
-
-        response = self.model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.3,
-                top_p=0.95,
-            ),
-        )
-        
-        response_text = response.text.strip()
+    
+    @staticmethod
+    def _parse_recommendations(response_text: str) -> List[str]:
+        """Parse recommendations from a recommendations response"""
+        response_text = response_text.strip()
         
         try:
             # Find JSON in response
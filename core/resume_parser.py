@@ -3,9 +3,10 @@ Resume Parser Module
 Handles extraction of text from various resume formats
 """
 
+import io
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, BinaryIO, Union
 
 
 class ResumeParser:
@@ -54,6 +55,30 @@ class ResumeParser:
         else:
             raise ValueError(f"Unsupported resume format: {file_ext}")
     
+    @staticmethod
+    def parse_bytes(data: bytes, filename: str) -> str:
+        """
+        Parse resume from in-memory file content (e.g. an archive entry)
+        
+        Args:
+            data: Raw file bytes
+            filename: Original filename, used to detect the format
+            
+        Returns:
+            Extracted resume text
+            
+        Raises:
+            ValueError: If format not supported
+        """
+        file_ext = Path(filename).suffix.lower()
+        
+        if file_ext == ".txt" or file_ext == ".md":
+            return data.decode("utf-8", errors="replace").strip()
+        elif file_ext == ".pdf":
+            return ResumeParser._parse_pdf(io.BytesIO(data))
+        else:
+            raise ValueError(f"Unsupported resume format: {file_ext}")
+    
     @staticmethod
     def _parse_text(file_path: str) -> str:
         """Parse plain text resume"""
@@ -61,17 +86,17 @@ class ResumeParser:
             return f.read().strip()
     
     @staticmethod
-    def _parse_pdf(file_path: str) -> str:
-        """Parse PDF resume"""
+    def _parse_pdf(source: Union[str, BinaryIO]) -> str:
+        """Parse PDF resume from a path or binary stream"""
         try:
             from pypdf import PdfReader
         except ImportError:
             raise ImportError("pypdf required for PDF parsing. Install with: pip install pypdf")
         
-        reader = PdfReader(file_path)
+        reader = PdfReader(source)
         text = ""
         for page in reader.pages:
-            text += page.extract_text()
+            text += page.extract_text() or ""
         
         return text.strip()
     
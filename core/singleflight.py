@@ -0,0 +1,210 @@
+"""
+Single-Flight Module
+Coalesces identical in-flight match requests so they share one computation
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from config import Config
+
+
+def request_key(resume_text: str, jd_text: str, **options: Any) -> str:
+    """
+    Build a stable key for a match request
+
+    Whitespace is collapsed so trivially different submissions of the same
+    text (trailing newlines, CRLF vs LF) coalesce.
+    """
+    payload = {
+        "resume": " ".join(resume_text.split()),
+        "jd": " ".join(jd_text.split()),
+        "options": options,
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class _Call:
+    """An in-flight computation that followers wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time
+
+    Concurrent callers with the same key block until the leader finishes and
+    receive its result (or exception). With a ``db``, the leader also takes a
+    lock row in the database so workers in other processes wait for it and
+    read the published result instead of recomputing.
+    """
+
+    def __init__(
+        self,
+        db=None,
+        timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        """Initialize coalescer, optionally shared across workers via ``db``"""
+        self.db = db
+        self.timeout = timeout or Config.SINGLE_FLIGHT_TIMEOUT
+        self.poll_interval = poll_interval or Config.SINGLE_FLIGHT_POLL_INTERVAL
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` once for all concurrent callers with the same key
+
+        Returns:
+            Tuple of (result, shared) where ``shared`` is True if the result
+            came from another caller's computation
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        shared = False
+        try:
+            if self.db is not None:
+                call.result, shared = self._do_across_workers(key, fn)
+            else:
+                call.result = fn()
+            return call.result, shared
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def _do_across_workers(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Coordinate with other processes through the database lock table"""
+        owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            if self.db.try_acquire_lock(key, owner, ttl=self.timeout):
+                try:
+                    result = fn()
+                    self.db.store_result(key, result, ttl=self.timeout)
+                    return result, False
+                finally:
+                    self.db.release_lock(key, owner)
+
+            # Another worker is computing; wait for its published result
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+
+                result = self.db.get_result(key, ttl=self.timeout)
+                if result is not None:
+                    return result, True
+
+                if not self.db.is_locked(key):
+                    # Holder finished without a result (e.g. it failed); retry ourselves
+                    break
+            else:
+                # Holder is stuck; compute without coordination rather than fail
+                return fn(), False
+
+
+class AsyncSingleFlight:
+    """
+    Event-loop variant of ``SingleFlight`` for the ASGI serving mode
+
+    The computation runs as a separate task that every caller (leader and
+    followers) awaits through ``asyncio.shield`` instead of blocking a
+    thread, so a disconnecting caller never cancels it for the others. The
+    optional cross-worker coordination runs its database calls in a thread.
+    """
+
+    def __init__(
+        self,
+        db=None,
+        timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        """Initialize coalescer, optionally shared across workers via ``db``"""
+        self.db = db
+        self.timeout = timeout or Config.SINGLE_FLIGHT_TIMEOUT
+        self.poll_interval = poll_interval or Config.SINGLE_FLIGHT_POLL_INTERVAL
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await ``fn`` once for all concurrent callers with the same key
+
+        Returns:
+            Tuple of (result, shared) as for ``SingleFlight.do``
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            # Shield so a disconnecting follower does not cancel the leader
+            return (await asyncio.shield(task))[0], True
+
+        # The shared work runs as its own task, so no caller going away
+        # (leader included) cancels it for the others
+        task = asyncio.ensure_future(self._run(key, fn))
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        """Forget a finished computation"""
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody awaited anymore is not logged
+            task.exception()
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Compute the result for ``key``, coordinating across workers if configured"""
+        if self.db is not None:
+            return await self._do_across_workers(key, fn)
+        return await fn(), False
+
+    async def _do_across_workers(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Coordinate with other processes through the database lock table"""
+        owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            if await asyncio.to_thread(self.db.try_acquire_lock, key, owner, self.timeout):
+                try:
+                    result = await fn()
+                    await asyncio.to_thread(self.db.store_result, key, result, self.timeout)
+                    return result, False
+                finally:
+                    await asyncio.to_thread(self.db.release_lock, key, owner)
+
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval)
+
+                result = await asyncio.to_thread(self.db.get_result, key, self.timeout)
+                if result is not None:
+                    return result, True
+
+                if not await asyncio.to_thread(self.db.is_locked, key):
+                    break
+            else:
+                return await fn(), False
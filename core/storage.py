@@ -0,0 +1,248 @@
+"""
+Storage Module
+Content-addressed storage for uploaded resume files and their extracted text
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+
+from config import Config
+from core.resume_parser import ResumeParser
+
+
+class StoredUpload(NamedTuple):
+    """An uploaded file stored under its content hash"""
+    digest: str
+    path: str
+    size: int
+    is_new: bool
+
+
+class UploadStore:
+    """
+    Store uploads as ``<root>/<aa>/<sha256><ext>`` with deduplication
+
+    Files are streamed to a temporary file in chunks while being hashed and
+    then atomically renamed into place, so concurrent uploads never clobber
+    each other. Extracted text is cached next to the blob and evicted with it.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    TEXT_SUFFIX = ".extracted"
+    TEMP_PREFIXES = (".upload-", ".text-")
+    TEMP_MAX_AGE = 3600  # temp files older than this were left by a crashed writer
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_age_seconds: Optional[int] = None,
+        evict_interval: int = 60,
+    ):
+        """Initialize store rooted at the upload folder"""
+        self.root = root or Config.UPLOAD_FOLDER
+        self.max_bytes = Config.UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_age_seconds = Config.UPLOAD_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+        self.evict_interval = evict_interval
+        self._last_evicted = 0.0
+        self._evict_lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def save(self, stream: BinaryIO, filename: str, max_size: Optional[int] = None) -> StoredUpload:
+        """
+        Stream an upload to disk, hashing it on the way
+
+        Args:
+            stream: Readable binary stream of the upload
+            filename: Original filename (only the extension is kept)
+            max_size: Optional byte limit for this upload
+
+        Returns:
+            StoredUpload describing the content-addressed file
+
+        Raises:
+            ValueError: If the upload exceeds ``max_size``
+        """
+        ext = os.path.splitext(filename)[1].lower()
+        hasher = hashlib.sha256()
+        size = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while True:
+                    chunk = stream.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise ValueError(f"Upload exceeds maximum size of {max_size} bytes")
+                    hasher.update(chunk)
+                    tmp.write(chunk)
+
+            digest = hasher.hexdigest()
+            path = self._blob_path(digest, ext)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            if os.path.exists(path):
+                # Duplicate content: keep the existing blob and mark it as recently used
+                os.remove(tmp_path)
+                os.utime(path)
+                is_new = False
+            else:
+                os.replace(tmp_path, path)
+                is_new = True
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.maybe_evict()
+        return StoredUpload(digest=digest, path=path, size=size, is_new=is_new)
+
+    def extract_text(self, upload: StoredUpload) -> str:
+        """Return extracted resume text, parsing the file only on a cache miss"""
+        text_path = self._text_path(upload.digest)
+
+        try:
+            with open(text_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+
+        # Always a file: an evicted blob must raise, not be parsed as raw text
+        text = ResumeParser._parse_file(upload.path)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(text_path), prefix=".text-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, text_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return text
+
+    def maybe_evict(self):
+        """Run eviction if the last pass is older than ``evict_interval``"""
+        now = time.time()
+        if now - self._last_evicted < self.evict_interval:
+            return
+
+        if not self._evict_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_evicted = now
+            self.evict()
+        finally:
+            self._evict_lock.release()
+
+    def evict(self) -> int:
+        """
+        Remove expired blobs, then the least recently used ones until the
+        store fits within ``max_bytes``
+
+        A blob's size includes its cached text. Files saved directly in the
+        root by the pre-content-addressed upload code are evicted the same
+        way; temp files abandoned by crashed writers are deleted on the way.
+
+        Returns:
+            Number of blobs removed
+        """
+        now = time.time()
+        removed = 0
+        blobs: List[Tuple[float, int, str]] = []
+
+        for path, mtime, size in self._scan(now):
+            if self.max_age_seconds and now - mtime > self.max_age_seconds:
+                removed += self._remove_blob(path)
+            else:
+                blobs.append((mtime, size, path))
+
+        if self.max_bytes:
+            total = sum(size for _, size, _ in blobs)
+            for _, size, path in sorted(blobs):
+                if total <= self.max_bytes:
+                    break
+                removed += self._remove_blob(path)
+                total -= size
+
+        return removed
+
+    def _scan(self, now: float) -> List[Tuple[str, float, int]]:
+        """
+        List (path, mtime, size) for every stored blob and legacy root file,
+        size including cached text, and delete stale temp files
+        """
+        blobs: List[Tuple[str, float, int]] = []
+
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                if shard.name.startswith("."):
+                    self._remove_stale_temp(shard, now)
+                    continue
+                try:
+                    stat = shard.stat()
+                except FileNotFoundError:
+                    continue
+                blobs.append((shard.path, stat.st_mtime, stat.st_size))
+                continue
+
+            files: List[Tuple[str, os.stat_result]] = []
+            text_sizes: Dict[str, int] = {}
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith("."):
+                    self._remove_stale_temp(entry, now)
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith(self.TEXT_SUFFIX):
+                    text_sizes[entry.name[:-len(self.TEXT_SUFFIX)]] = stat.st_size
+                else:
+                    files.append((entry.path, stat))
+
+            for path, stat in files:
+                digest = os.path.splitext(os.path.basename(path))[0]
+                blobs.append((path, stat.st_mtime, stat.st_size + text_sizes.get(digest, 0)))
+
+        return blobs
+
+    def _remove_stale_temp(self, entry: os.DirEntry, now: float):
+        """Delete a temp file no writer has touched for ``TEMP_MAX_AGE``"""
+        if not entry.name.startswith(self.TEMP_PREFIXES):
+            return
+        try:
+            if now - entry.stat().st_mtime > self.TEMP_MAX_AGE:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+    def _remove_blob(self, path: str) -> int:
+        """Delete a blob and its cached text (legacy root files have none)"""
+        targets = [path]
+        if os.path.normpath(os.path.dirname(path)) != os.path.normpath(self.root):
+            digest = os.path.splitext(os.path.basename(path))[0]
+            targets.append(self._text_path(digest))
+
+        for target in targets:
+            try:
+                os.remove(target)
+            except FileNotFoundError:
+                pass
+        return 1
+
+    def _blob_path(self, digest: str, ext: str) -> str:
+        """Path of the stored file for a digest"""
+        return os.path.join(self.root, digest[:2], digest + ext)
+
+    def _text_path(self, digest: str) -> str:
+        """Path of the cached extracted text for a digest"""
+        return os.path.join(self.root, digest[:2], digest + self.TEXT_SUFFIX)
@@ -0,0 +1,473 @@
+"""
+Watcher Module
+Continuous screening of resumes dropped into a watched directory
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from config import Config
+from core.dedup import normalized_hash
+from core.jd_parser import JDParser
+from core.matcher import Matcher
+from core.resume_parser import ResumeParser
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional; fall back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
+# (size, mtime in ns) identifies a version of a file without reading it
+FileStat = Tuple[int, int]
+
+
+def snapshot(folder: str, extensions: Iterable[str]) -> Dict[str, FileStat]:
+    """Stat every visible file with a matching extension under ``folder``"""
+    extensions = set(extensions)
+    found = {}
+    stack = [folder]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith((".", "~$")):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in extensions:
+                        stat = entry.stat()
+                        found[entry.path] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue
+    return found
+
+
+def load_jds(source: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Load the active job descriptions
+
+    Args:
+        source: A JD file, a directory of ``.txt``/``.md`` JD files, or raw text
+
+    Returns:
+        Dict of normalized JD hash -> (name, JD text)
+    """
+    if os.path.isdir(source):
+        paths = sorted(snapshot(source, {".txt", ".md"}))
+    elif os.path.isfile(source):
+        paths = [source]
+    else:
+        jd_text = JDParser.parse(source)["raw_text"]
+        return {normalized_hash(jd_text): ("jd", jd_text)}
+
+    jds = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            jd_text = JDParser.parse(f.read())["raw_text"]
+        jds[normalized_hash(jd_text)] = (os.path.basename(path), jd_text)
+    return jds
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Forward filesystem events to the watcher"""
+
+    def __init__(self, watcher: "FolderWatcher"):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        if event.is_directory:
+            # A directory moved in or out; its contents produce no file events
+            self.watcher.request_rescan()
+            return
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if path:
+                self.watcher.notify(os.fsdecode(path))
+
+
+class FolderWatcher:
+    """
+    Screen resumes in a directory as they arrive
+
+    Changes are picked up from inotify (via ``watchdog``) when available, or
+    by polling directory stats. A file is processed once its size and mtime
+    have been stable for ``settle_seconds``, so partially copied files are
+    not parsed. Each new file version is hashed and scored only against the
+    JDs its content has not been handled against yet (``watch_results``), so
+    restarts, renames and re-copies never re-score. At most ``workers``
+    files are processed at once. While nothing changes the loop only sleeps
+    (inotify) or stats the directory every ``poll_interval`` (polling).
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        jd_source: str,
+        matcher,
+        db,
+        finder=None,
+        include_recommendations: bool = False,
+        workers: Optional[int] = None,
+        settle_seconds: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        use_inotify: bool = True,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """Initialize watcher for ``folder`` scoring against the JDs in ``jd_source``"""
+        self.folder = os.path.abspath(folder)
+        self.jd_source = jd_source
+        self.matcher = matcher
+        self.db = db
+        self.finder = finder
+        self.include_recommendations = include_recommendations
+        self.workers = max(1, workers or Config.WATCH_WORKERS)
+        self.max_in_flight = self.workers * 2
+        self.settle_seconds = Config.WATCH_SETTLE_SECONDS if settle_seconds is None else settle_seconds
+        self.poll_interval = poll_interval or Config.WATCH_POLL_INTERVAL
+        self.rescan_interval = Config.WATCH_RESCAN_INTERVAL
+        self.retry_seconds = Config.WATCH_RETRY_SECONDS
+        self.use_inotify = use_inotify and Observer is not None
+        self.on_result = on_result or (lambda entry: None)
+        self.mode = "inotify" if self.use_inotify else "polling"
+
+        self.jds = load_jds(jd_source)
+        self._jd_stats = self._jd_snapshot()
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._dirty: Set[str] = set()
+        self._rescan = True
+        # Serializes workers holding identical content (e.g. a file and its copy);
+        # entries are (lock, holders) and removed when the last holder is done
+        self._content_locks: Dict[str, Tuple[threading.Lock, int]] = {}
+
+        # Only touched by the loop thread
+        self._known: Dict[str, FileStat] = {}
+        self._pending: Dict[str, Tuple[FileStat, float]] = {}
+        self._in_flight: Dict[str, Tuple[Future, FileStat]] = {}
+        self._retry_at: Dict[str, float] = {}
+
+    def notify(self, path: str):
+        """Mark a path as possibly changed and wake the loop"""
+        with self._lock:
+            self._dirty.add(path)
+        self._wake.set()
+
+    def request_rescan(self):
+        """Schedule a full directory scan on the next loop iteration"""
+        with self._lock:
+            self._rescan = True
+        self._wake.set()
+
+    def stop(self):
+        """Stop the loop; files already being processed are finished"""
+        self._stopped.set()
+        self._wake.set()
+
+    def run(self):
+        """Watch until ``stop()`` is called (or the thread is interrupted)"""
+        observer = self._start_observer()
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watch")
+        next_rescan = 0.0
+
+        try:
+            while not self._stopped.is_set():
+                self._wake.clear()
+                now = time.monotonic()
+
+                with self._lock:
+                    rescan = self._rescan or now >= next_rescan
+                    self._rescan = False
+                    dirty, self._dirty = self._dirty, set()
+
+                if rescan:
+                    self._reload_jds()
+                    stats = self._full_scan()
+                    next_rescan = now + (self.rescan_interval if observer else self.poll_interval)
+                else:
+                    stats = {path: self._stat(path) for path in dirty}
+
+                # Files waiting to settle are re-checked every iteration
+                for path in self._pending:
+                    if path not in stats:
+                        stats[path] = self._stat(path)
+
+                for path, retry_at in list(self._retry_at.items()):
+                    if retry_at <= now:
+                        del self._retry_at[path]
+                        if path not in stats:
+                            stats[path] = self._stat(path)
+
+                self._harvest()
+                self._update(stats, now)
+                self._submit_ready(pool, now)
+
+                self._wake.wait(self._next_timeout(next_rescan))
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            pool.shutdown(wait=True, cancel_futures=True)
+            self.db.remove_session()
+
+    def _start_observer(self):
+        """Start an inotify observer, or return None to poll instead"""
+        if not self.use_inotify:
+            return None
+        try:
+            observer = Observer()
+            observer.schedule(_ChangeHandler(self), self.folder, recursive=True)
+            observer.start()
+            return observer
+        except OSError:
+            # e.g. the inotify watch limit is exhausted
+            self.mode = "polling"
+            return None
+
+    def _full_scan(self) -> Dict[str, Optional[FileStat]]:
+        """Stat the whole folder, reporting vanished files as None"""
+        stats: Dict[str, Optional[FileStat]] = dict(snapshot(self.folder, ResumeParser.SUPPORTED_FORMATS))
+        for path in set(self._known) | set(self._pending):
+            stats.setdefault(path, None)
+        return stats
+
+    @staticmethod
+    def _stat(path: str) -> Optional[FileStat]:
+        """Size and mtime of a supported, visible file (None if gone or ignored)"""
+        name = os.path.basename(path)
+        if name.startswith((".", "~$")) or os.path.splitext(name)[1].lower() not in ResumeParser.SUPPORTED_FORMATS:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _update(self, stats: Dict[str, Optional[FileStat]], now: float):
+        """Track new and changed files until they settle"""
+        for path, stat in stats.items():
+            if stat is None:
+                self._known.pop(path, None)
+                self._pending.pop(path, None)
+                self._retry_at.pop(path, None)
+                continue
+
+            if path in self._in_flight or self._known.get(path) == stat:
+                self._pending.pop(path, None)
+                continue
+
+            if self._retry_at.get(path, 0) > now:
+                continue
+
+            previous = self._pending.get(path)
+            if previous is None or previous[0] != stat:
+                # Files already untouched for the settle window need not wait again
+                age = max(0.0, time.time() - stat[1] / 1e9)
+                self._pending[path] = (stat, now - age)
+
+    def _submit_ready(self, pool: ThreadPoolExecutor, now: float):
+        """Hand settled files to the worker pool, keeping its queue bounded"""
+        jds = dict(self.jds)
+        for path, (stat, since) in list(self._pending.items()):
+            if len(self._in_flight) >= self.max_in_flight:
+                break
+            if now - since < self.settle_seconds:
+                continue
+
+            del self._pending[path]
+            future = pool.submit(self._process, path, jds)
+            future.add_done_callback(lambda _: self._wake.set())
+            self._in_flight[path] = (future, stat)
+
+    def _harvest(self):
+        """Collect finished files; failed ones are retried after a delay"""
+        for path, (future, stat) in list(self._in_flight.items()):
+            if not future.done():
+                continue
+
+            del self._in_flight[path]
+            if future.exception() is None:
+                self._known[path] = stat
+                self._retry_at.pop(path, None)
+            else:
+                self._retry_at[path] = time.monotonic() + self.retry_seconds
+
+            # The file may have changed while it was being processed
+            with self._lock:
+                self._dirty.add(path)
+
+    def _next_timeout(self, next_rescan: float) -> float:
+        """How long the loop can sleep before it has work to do"""
+        now = time.monotonic()
+        deadlines = [next_rescan]
+        if len(self._in_flight) < self.max_in_flight:
+            # With the pool full, a finishing file wakes the loop instead
+            deadlines.extend(since + self.settle_seconds for _, since in self._pending.values())
+        deadlines.extend(self._retry_at.values())
+        if self._dirty:
+            deadlines.append(now)
+        return max(0.05, min(deadlines) - now)
+
+    def _jd_snapshot(self) -> Optional[Dict[str, FileStat]]:
+        """Stats of the JD directory (None when JDs are not a directory)"""
+        if os.path.isdir(self.jd_source):
+            return snapshot(self.jd_source, {".txt", ".md"})
+        return None
+
+    def _reload_jds(self):
+        """Pick up added, edited or removed JD files"""
+        stats = self._jd_snapshot()
+        if stats is None or stats == self._jd_stats:
+            return
+
+        self._jd_stats = stats
+        jds = load_jds(self.jd_source)
+        if set(jds) != set(self.jds):
+            self.jds = jds
+            # Re-check every file; only pairs missing a result are scored
+            self._known.clear()
+
+    def _process(self, path: str, jds: Dict[str, Tuple[str, str]]):
+        """
+        Parse one file version and score it against every JD not yet handled
+
+        Unreadable, unparseable or invalid content is recorded as failed and
+        not retried until the file changes; scoring errors are raised so the
+        file is retried later.
+        """
+        name = os.path.relpath(path, self.folder)
+        try:
+            if os.path.getsize(path) > Config.MAX_RESUME_FILE_BYTES:
+                self._record_failure(path, name, None, jds, "File is too large")
+                return
+
+            with open(path, "rb") as f:
+                data = f.read()
+            content_hash = hashlib.sha256(data).hexdigest()
+
+            with self._lock:
+                content_lock, holders = self._content_locks.get(content_hash, (threading.Lock(), 0))
+                self._content_locks[content_hash] = (content_lock, holders + 1)
+            try:
+                with content_lock:
+                    self._process_content(path, name, data, content_hash, jds)
+            finally:
+                with self._lock:
+                    content_lock, holders = self._content_locks[content_hash]
+                    if holders == 1:
+                        del self._content_locks[content_hash]
+                    else:
+                        self._content_locks[content_hash] = (content_lock, holders - 1)
+        finally:
+            self.db.remove_session()
+
+    def _process_content(
+        self,
+        path: str,
+        name: str,
+        data: bytes,
+        content_hash: str,
+        jds: Dict[str, Tuple[str, str]],
+    ):
+        """Score one file's content against the JDs it has not been handled against"""
+        handled = set(self.db.get_watched_jds(content_hash))
+        missing = {jd_hash: jd for jd_hash, jd in jds.items() if jd_hash not in handled}
+        if not missing:
+            return
+
+        try:
+            resume_text = ResumeParser.parse_bytes(data, name)
+            ResumeParser.validate(resume_text, max_length=Config.MAX_RESUME_LENGTH)
+        except Exception as e:
+            self._record_failure(path, name, content_hash, missing, str(e))
+            return
+
+        signature = self.finder.hasher.signature(resume_text) if self.finder is not None else None
+
+        error = None
+        for jd_hash, (jd_name, jd_text) in missing.items():
+            try:
+                Matcher.validate_inputs(resume_text, jd_text)
+            except ValueError as e:
+                # Rejected input never succeeds on retry; record it until the file changes
+                self.db.record_watch_result(content_hash, jd_hash, path, "failed", error=str(e))
+                self.on_result({"name": name, "jd": jd_name, "status": "failed", "error": str(e)})
+                continue
+
+            try:
+                entry = self._score(resume_text, jd_text, signature)
+            except Exception as e:
+                error = error or e
+                self.on_result({"name": name, "jd": jd_name, "status": "error", "error": str(e)})
+                continue
+
+            self.db.record_watch_result(
+                content_hash, jd_hash, path, entry["status"],
+                score=entry["score"], match_id=entry["id"],
+            )
+            self.on_result(dict(entry, name=name, jd=jd_name))
+
+        if error is not None:
+            raise error
+
+    def _score(self, resume_text: str, jd_text: str, signature) -> Dict[str, Any]:
+        """Score and save one resume/JD pair (or reuse a stored near-duplicate)"""
+        duplicate = None
+        if self.finder is not None:
+            duplicate = self.finder.find_match(resume_text, jd_text, signature)
+
+        if duplicate and Config.NEAR_DUP_MODE == "reuse":
+            record, similarity = duplicate
+            return {
+                "status": "duplicate",
+                "id": record.id,
+                "score": record.score,
+                "near_duplicate_of": record.id,
+                "similarity": round(similarity, 3),
+            }
+
+        result = self.matcher.match(
+            resume_text, jd_text, include_recommendations=self.include_recommendations
+        )
+        record = self.db.save_match(
+            resume_text=resume_text,
+            jd_text=jd_text,
+            score=result["score"],
+            explanation=result["explanation"],
+            recommendations=result.get("recommendations", []),
+        )
+        if self.finder is not None:
+            self.finder.record(record.id, resume_text, jd_text, signature)
+
+        entry = {"status": "completed", "id": record.id, "score": result["score"]}
+        if duplicate:
+            record, similarity = duplicate
+            entry["near_duplicate_of"] = record.id
+            entry["similarity"] = round(similarity, 3)
+        return entry
+
+    def _record_failure(
+        self,
+        path: str,
+        name: str,
+        content_hash: Optional[str],
+        jds: Dict[str, Tuple[str, str]],
+        error: str,
+    ):
+        """Record a permanent failure against each JD and report it"""
+        if content_hash is not None:
+            for jd_hash in jds:
+                self.db.record_watch_result(content_hash, jd_hash, path, "failed", error=error)
+        self.on_result({"name": name, "jd": None, "status": "failed", "error": error})
@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration
+Threaded (gthread) worker profile for the Flask app
+
+Each worker process runs ``threads`` request threads, so requests waiting on
+Gemini no longer block the whole worker. Keep ``DB_POOL_SIZE + DB_MAX_OVERFLOW``
+at or above ``threads`` so every thread can get a database connection.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+
+# Gemini calls can take several seconds; leave headroom for two of them
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+keepalive = 5
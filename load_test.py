@@ -0,0 +1,60 @@
+"""
+Load test for the web API
+Fires concurrent requests at an endpoint and reports throughput and latency
+
+Usage:
+    python load_test.py --url http://127.0.0.1:5000/api/matches -n 500 -c 50
+    python load_test.py --url http://127.0.0.1:5000/api/match --json samples/load_test_payload.json -n 400 -c 64
+
+Serve ``load_test_stub:app`` to measure worker profiles without calling Gemini.
+"""
+
+import argparse
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def send(url: str, body: bytes = None) -> float:
+    """Send one request and return its latency in seconds (negative on failure)"""
+    headers = {"Content-Type": "application/json"} if body else {}
+    req = urllib.request.Request(url, data=body, headers=headers, method="POST" if body else "GET")
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=300) as response:
+            response.read()
+        return time.perf_counter() - start
+    except (urllib.error.URLError, OSError):
+        return -1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the resume matcher API")
+    parser.add_argument("--url", default="http://127.0.0.1:5000/api/matches", help="Endpoint to hit")
+    parser.add_argument("--json", help="File with a JSON body (sends POST)")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="Total requests")
+    parser.add_argument("-c", "--concurrency", type=int, default=20, help="Concurrent clients")
+    args = parser.parse_args()
+
+    body = open(args.json, "rb").read() if args.json else None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = list(pool.map(lambda _: send(args.url, body), range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    ok = sorted(l for l in latencies if l >= 0)
+    failed = len(latencies) - len(ok)
+
+    print(f"Requests:    {args.requests} ({failed} failed), concurrency {args.concurrency}")
+    print(f"Elapsed:     {elapsed:.2f}s")
+    print(f"Throughput:  {len(ok) / elapsed:.1f} req/s")
+    if ok:
+        print(f"Latency p50: {statistics.median(ok) * 1000:.0f} ms")
+        print(f"Latency p95: {ok[min(len(ok) - 1, int(len(ok) * 0.95))] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
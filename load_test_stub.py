@@ -0,0 +1,33 @@
+"""
+Load test target
+The real Flask app with Gemini replaced by a fixed delay, so worker profiles
+can be compared without API keys or quota
+
+Usage:
+    STUB_LATENCY_MS=250 gunicorn -c gunicorn.conf.py load_test_stub:app
+    python load_test.py --url http://127.0.0.1:5000/api/match --json samples/load_test_payload.json
+"""
+
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "stub")
+os.environ.setdefault("DATABASE_URL", "sqlite:///load_test.db")
+
+import core.matcher
+import ui.web_app
+from ui.web_app import app
+
+STUB_LATENCY = float(os.getenv("STUB_LATENCY_MS", 250)) / 1000
+
+
+def _stub_match(self, resume_text, jd_text, include_recommendations=True):
+    """Stand-in for a Gemini round trip: blocks like network I/O, no CPU"""
+    time.sleep(STUB_LATENCY)
+    return {"score": 50.0, "explanation": "stub", "recommendations": []}
+
+
+core.matcher.Matcher.match = _stub_match
+
+# Every request must reach the stubbed call; do not coalesce identical payloads
+ui.web_app.match_flight.do = lambda key, fn: (fn(), False)
@@ -12,11 +12,28 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and (sys.argv[1] == "--web" or sys.argv[1] == "web"):
         # Remove '--web' or 'web' from argv before passing to Flask
         sys.argv.pop(1)
-        from ui.web_app import app
         from config import Config
-        print("🚀 Starting Web Server...")
-        print(f"📱 Open browser: http://127.0.0.1:{Config.FLASK_PORT}")
-        app.run(debug=Config.FLASK_DEBUG, port=Config.FLASK_PORT)
+        async_mode = Config.ASYNC_MODE or "--async" in sys.argv
+        if "--async" in sys.argv:
+            sys.argv.remove("--async")
+        
+        if async_mode:
+            # Async/ASGI mode: one event loop serves many in-flight matches
+            import asyncio
+            from hypercorn.asyncio import serve
+            from hypercorn.config import Config as HypercornConfig
+            from ui.asgi_app import app
+            
+            server_config = HypercornConfig()
+            server_config.bind = [f"127.0.0.1:{Config.FLASK_PORT}"]
+            print("🚀 Starting Web Server (async)...")
+            print(f"📱 Open browser: http://127.0.0.1:{Config.FLASK_PORT}")
+            asyncio.run(serve(app, server_config))
+        else:
+            from ui.web_app import app
+            print("🚀 Starting Web Server...")
+            print(f"📱 Open browser: http://127.0.0.1:{Config.FLASK_PORT}")
+            app.run(debug=Config.FLASK_DEBUG, port=Config.FLASK_PORT)
     else:
         # Default to CLI
         sys.exit(cli_main())
@@ -0,0 +1,109 @@
+"""
+ASGI entry point
+Async serving mode: the Gemini-bound match endpoint runs on an event loop,
+all other routes are served by the Flask app through a WSGI adapter
+"""
+
+import asyncio
+from a2wsgi import WSGIMiddleware
+from quart import Quart, request, jsonify
+
+from core.matcher import Matcher
+from core.singleflight import AsyncSingleFlight, request_key
+from config import Config
+from ui.web_app import app as flask_app, db, near_dups
+
+quart_app = Quart(__name__)
+
+# Coalesce identical in-flight match requests (optionally across workers)
+match_flight = AsyncSingleFlight(db if Config.SINGLE_FLIGHT_CROSS_WORKER else None)
+
+# One matcher is shared by all in-flight requests on the event loop
+_matcher = None
+
+
+def get_matcher() -> Matcher:
+    """Create the shared matcher on first use"""
+    global _matcher
+    if _matcher is None:
+        _matcher = Matcher()
+    return _matcher
+
+
+@quart_app.route("/api/match", methods=["POST"])
+async def api_match():
+    """Async API endpoint for matching"""
+    try:
+        data = await request.get_json()
+
+        if not data:
+            return jsonify({"error": "No JSON data provided"}), 400
+
+        resume_text = data.get("resume", "").strip()
+        jd_text = data.get("jd", "").strip()
+        save_match = data.get("save", False)
+
+        if not resume_text or not jd_text:
+            return jsonify({"error": "Both resume and JD are required"}), 400
+
+        async def compute():
+            # Check for a stored match of a near-identical resume against this JD
+            duplicate = None
+            signature = None
+            if Config.NEAR_DUP_MODE != "off":
+                signature = await asyncio.to_thread(near_dups.hasher.signature, resume_text)
+                duplicate = await asyncio.to_thread(near_dups.find_match, resume_text, jd_text, signature)
+
+            if duplicate and Config.NEAR_DUP_MODE == "reuse":
+                record, similarity = duplicate
+                return dict(record.to_dict(), near_duplicate_of=record.id, similarity=round(similarity, 3))
+
+            # Perform matching without blocking the event loop
+            result = await get_matcher().match_async(resume_text, jd_text, include_recommendations=True)
+
+            if duplicate:
+                record, similarity = duplicate
+                result["near_duplicate_of"] = record.id
+                result["similarity"] = round(similarity, 3)
+
+            # Save to database if requested
+            if save_match:
+                record = await asyncio.to_thread(
+                    db.save_match,
+                    resume_text=resume_text,
+                    jd_text=jd_text,
+                    score=result["score"],
+                    explanation=result["explanation"],
+                    recommendations=result.get("recommendations", []),
+                )
+                result["id"] = record.id
+
+                if signature is not None:
+                    await asyncio.to_thread(near_dups.record, record.id, resume_text, jd_text, signature)
+
+            return result
+
+        key = request_key(resume_text, jd_text, recommendations=True, save=bool(save_match))
+        result, shared = await match_flight.do(key, compute)
+        result = dict(result, coalesced=shared)
+
+        return jsonify(result)
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Routes handled natively on the event loop; everything else goes to Flask
+ASYNC_ROUTES = {("POST", "/api/match")}
+
+wsgi_app = WSGIMiddleware(flask_app, workers=Config.ASGI_WSGI_THREADS)
+
+
+async def app(scope, receive, send):
+    """ASGI application dispatching between the async and Flask routes"""
+    if scope["type"] == "lifespan" or (
+        scope["type"] == "http" and (scope["method"], scope["path"]) in ASYNC_ROUTES
+    ):
+        await quart_app(scope, receive, send)
+    else:
+        await wsgi_app(scope, receive, send)
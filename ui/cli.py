@@ -4,14 +4,20 @@ Main entry point for CLI usage
 """
 
 import argparse
+import os
 import sys
-import json
+import threading
 from typing import Optional
 
+from config import Config
 from core.matcher import Matcher
 from core.database import Database
 from core.resume_parser import ResumeParser
 from core.jd_parser import JDParser
+from core.batch import WEB_RUN_PREFIX, BatchJob, BatchProcessor, RunCheckpointer, iter_source, list_source, save_run_stats
+from core.dedup import NearDuplicateFinder
+from core.export import FORMATS, detect_format, iter_export, iter_import
+from core.watcher import FolderWatcher
 
 
 def print_match_result(result: dict, verbose: bool = False):
@@ -27,12 +33,30 @@ def print_match_result(result: dict, verbose: bool = False):
             print(f"{i}. {rec}")
     
     if verbose:
+        if "tier" in result:
+            print(f"\nScored by: {result['tier']} model")
         print(f"\nResume Preview: {result.get('resume_preview', 'N/A')[:100]}...")
         print(f"JD Preview: {result.get('jd_preview', 'N/A')[:100]}...")
     
     print("\n")
 
 
+def print_model_stats(stats: dict, title: str = "Model calls"):
+    """Print per-tier model call counts, latency and cascade escalation"""
+    tiers = ", ".join(
+        f"{tier} {data['calls']} (avg {data['avg_latency_ms']} ms)"
+        for tier, data in stats["tiers"].items()
+        if data["calls"]
+    )
+    print(f"{title}: {tiers or 'none'}")
+    
+    if stats["scored"]:
+        line = f"Cascade: {stats['scored']} scored, {stats['escalated']} escalated ({stats['escalation_rate']:.0%})"
+        if stats["agreement_rate"] is not None:
+            line += f", fast/strong agreement {stats['agreement_rate']:.0%}"
+        print(line)
+
+
 def cmd_match(args):
     """Handle match command"""
     try:
@@ -142,12 +166,8 @@ def cmd_recommend(args):
         print("\nRecommendations:")
         
         if match.recommendations:
-            try:
-                recs = json.loads(match.recommendations)
-                for i, rec in enumerate(recs, 1):
-                    print(f"{i}. {rec}")
-            except:
-                print(match.recommendations)
+            for i, rec in enumerate(match.recommendations, 1):
+                print(f"{i}. {rec}")
         else:
             print("No recommendations available for this match")
         
@@ -159,6 +179,236 @@ def cmd_recommend(args):
         return False
 
 
+def _load_jd(jd: str) -> str:
+    """Read job description from a file path, or return raw text as-is"""
+    if os.path.isfile(jd):
+        with open(jd, "r", encoding="utf-8") as f:
+            return f.read()
+    return jd
+
+
+def cmd_batch(args):
+    """Screen a directory or ZIP of resumes as a resumable, checkpointed run"""
+    try:
+        db = Database()
+        
+        if args.resume_run:
+            run = db.get_run(args.resume_run)
+            if not run:
+                print(f"Error: Batch run {args.resume_run} not found")
+                return False
+            
+            if run["source"].startswith(WEB_RUN_PREFIX) or not os.path.exists(run["source"]):
+                print(
+                    f"Error: Batch run {args.resume_run} cannot be resumed here: its source "
+                    f"{run['source']} is not a local directory or ZIP (web uploads are not kept)"
+                )
+                return False
+            
+            run_id = run["id"]
+            source = run["source"]
+            jd_text = run["jd_text"]
+            options = run["options"]
+            
+            # Completed and duplicate items are skipped; failed ones are retried
+            items = db.list_run_items(run_id, statuses=["pending", "failed"])
+            if not items:
+                db.set_run_status(run_id, "completed")
+                print(f"Batch run {run_id} has no pending or failed items")
+                return True
+            print(f"Resuming batch run {run_id}: {len(items)} pending/failed of {sum(run['counts'].values())} resumes")
+        else:
+            if not args.jd:
+                print("Error: --jd is required")
+                return False
+            
+            if not os.path.exists(args.batch):
+                print(f"Error: Batch source not found: {args.batch}")
+                return False
+            
+            source = os.path.abspath(args.batch)
+            jd_text = JDParser.parse(_load_jd(args.jd))["raw_text"]
+            options = {"save": args.save, "recommendations": not args.no_recommendations}
+            
+            names = list_source(source)
+            if not names:
+                print(f"Error: No supported resume files in {args.batch}")
+                return False
+            
+            run_id = db.create_run(source, jd_text, names, options)
+            items = db.list_run_items(run_id)
+            print(f"Started batch run {run_id} with {len(items)} resumes")
+        
+        print(f"(If interrupted, continue with: python main.py --resume-run {run_id})")
+        
+        item_ids = {item["name"]: item["id"] for item in items}
+        checkpointer = RunCheckpointer(db, item_ids, run_id)
+        job = BatchJob(jd_text, checkpointer=checkpointer, run_id=run_id)
+        finder = NearDuplicateFinder(db) if Config.NEAR_DUP_MODE != "off" else None
+        processor = BatchProcessor(Matcher(), db, finder=finder)
+        
+        worker = threading.Thread(
+            target=processor.run,
+            args=(job, iter_source(source, set(item_ids))),
+            kwargs={
+                "save": options.get("save", False),
+                "include_recommendations": options.get("recommendations", False),
+            },
+            daemon=True,
+        )
+        
+        try:
+            worker.start()
+            while worker.is_alive():
+                worker.join(timeout=2)
+                progress = job.to_dict(include_results=False)
+                print(
+                    f"\r  {progress['scored'] + progress['failed'] + progress['duplicates']}/{len(items)} done "
+                    f"({progress['scored']} scored, {progress['duplicates']} duplicates, {progress['failed']} failed)",
+                    end="",
+                    flush=True,
+                )
+            print()
+        except KeyboardInterrupt:
+            print("\nInterrupted; saving progress...")
+        finally:
+            # Persist whatever finished, even on Ctrl-C
+            checkpointer.flush()
+            run_stats = save_run_stats(db, run_id, processor.matcher.stats)
+            remaining = db.list_run_items(run_id, statuses=["pending", "failed"])
+            db.set_run_status(run_id, "incomplete" if remaining else "completed")
+        
+        if job.error:
+            print(f"Error: {job.error}")
+        
+        progress = job.to_dict()
+        results = [r for r in progress["results"] if "score" in r]
+        print("\n" + "=" * 60)
+        print(
+            f"BATCH RUN {run_id}: {progress['scored']} scored, {progress['duplicates']} duplicates "
+            f"this session, {len(remaining)} remaining"
+        )
+        print("=" * 60)
+        for i, result in enumerate(results[:10], 1):
+            if result.get("duplicate_of"):
+                origin = f" (duplicate of {result['duplicate_of']})"
+            elif result.get("reused"):
+                origin = f" (reused match {result['near_duplicate_of']})"
+            else:
+                origin = ""
+            print(f"{i}. {result['score']:.1f} | {result['name']}{origin}")
+        
+        print()
+        print_model_stats(processor.matcher.stats.to_dict(), "Model calls this session")
+        if run_stats.state() != processor.matcher.stats.state():
+            print_model_stats(run_stats.to_dict(), "Model calls for the whole run")
+        
+        if remaining:
+            print(f"\n{len(remaining)} items failed or were not reached; retry with --resume-run {run_id}")
+        
+        print("\n")
+        return not remaining
+    
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+
+def cmd_watch(args):
+    """Continuously screen resumes dropped into a directory until Ctrl-C"""
+    try:
+        if not args.jd:
+            print("Error: --jd is required (a JD file, a directory of JD files, or text)")
+            return False
+        
+        if not os.path.isdir(args.watch):
+            print(f"Error: Watch directory not found: {args.watch}")
+            return False
+        
+        db = Database()
+        finder = NearDuplicateFinder(db) if Config.NEAR_DUP_MODE != "off" else None
+        
+        def report(entry):
+            jd = f" vs {entry['jd']}" if entry.get("jd") else ""
+            if entry["status"] in ("completed", "duplicate"):
+                reused = " (near-duplicate, reused)" if entry["status"] == "duplicate" else ""
+                print(f"  {entry['score']:5.1f} | {entry['name']}{jd}{reused} [ID {entry['id']}]", flush=True)
+            else:
+                print(f"  error | {entry['name']}{jd}: {entry['error']}", flush=True)
+        
+        matcher = Matcher()
+        watcher = FolderWatcher(
+            args.watch,
+            args.jd,
+            matcher,
+            db,
+            finder=finder,
+            include_recommendations=not args.no_recommendations,
+            use_inotify=not args.poll,
+            on_result=report,
+        )
+        
+        print(f"Watching {watcher.folder} ({watcher.mode}) against {len(watcher.jds)} job description(s):")
+        for name, _ in watcher.jds.values():
+            print(f"  - {name}")
+        print("Press Ctrl-C to stop.")
+        
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            print("\nStopping; finishing files in progress...")
+        
+        print_model_stats(matcher.stats.to_dict())
+        return True
+    
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+
+def cmd_export(args):
+    """Stream all stored matches to a CSV or JSONL file (or stdout with '-')"""
+    try:
+        fmt = args.format or detect_format(args.export)
+        db = Database()
+        
+        out = sys.stdout if args.export == "-" else open(args.export, "w", encoding="utf-8", newline="")
+        try:
+            for chunk in iter_export(db.iter_matches(), fmt):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        
+        if out is not sys.stdout:
+            print(f"✓ Exported matches to {args.export}")
+        return True
+    
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+
+
+def cmd_import(args):
+    """Bulk import matches from a CSV or JSONL export"""
+    try:
+        fmt = args.format or detect_format(args.import_file)
+        db = Database()
+        
+        with open(args.import_file, "r", encoding="utf-8", newline="") as f:
+            imported = db.bulk_import_matches(iter_import(f, fmt))
+        
+        print(f"✓ Imported {imported} matches")
+        return True
+    
+    except ValueError as e:
+        print(f"Error: {e} (no matches were imported)")
+        return False
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -169,6 +419,11 @@ Examples:
   python main.py --resume resume.pdf --jd "job_desc.txt" --save
   python main.py --list-scores
   python main.py --recommend --score-id 1
+  python main.py --batch resumes/ --jd job_desc.txt --save
+  python main.py --resume-run 3
+  python main.py --watch inbox/ --jd active_jds/
+  python main.py --export matches.csv
+  python main.py --import matches.jsonl
         """,
     )
     
@@ -180,6 +435,13 @@ Examples:
     parser.add_argument("--list-scores", action="store_true", help="List all stored matches")
     parser.add_argument("--recommend", action="store_true", help="Get recommendations for a match")
     parser.add_argument("--score-id", type=int, help="ID of match to get recommendations for")
+    parser.add_argument("--batch", help="Directory or ZIP of resumes to screen as a resumable run")
+    parser.add_argument("--resume-run", type=int, help="ID of a batch run to continue (retries failed and pending)")
+    parser.add_argument("--watch", help="Directory to watch; new or changed resumes are scored and saved continuously")
+    parser.add_argument("--poll", action="store_true", help="With --watch, poll the directory instead of using inotify")
+    parser.add_argument("--export", help="Export all matches to a CSV/JSONL file ('-' for stdout)")
+    parser.add_argument("--import", dest="import_file", help="Bulk import matches from a CSV/JSONL file")
+    parser.add_argument("--format", choices=sorted(FORMATS), help="Export/import format (default: from file extension)")
     
     args = parser.parse_args()
     
@@ -188,6 +450,14 @@ Examples:
         success = cmd_list_scores(args)
     elif args.recommend:
         success = cmd_recommend(args)
+    elif args.batch or args.resume_run:
+        success = cmd_batch(args)
+    elif args.watch:
+        success = cmd_watch(args)
+    elif args.export:
+        success = cmd_export(args)
+    elif args.import_file:
+        success = cmd_import(args)
     elif args.resume and args.jd:
         success = cmd_match(args)
     else:
@@ -0,0 +1,199 @@
+"""
+HTTP Caching Module
+Conditional GET, response compression and content-hashed static assets
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from flask import Response, abort, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+MIN_COMPRESS_SIZE = 512
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+
+def _encodings():
+    """Content encodings this server can produce, most preferred first"""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def _negotiate_encoding() -> Optional[str]:
+    """Pick the best encoding the client accepts"""
+    return request.accept_encodings.best_match(_encodings())
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    """Compress bytes with the given content encoding"""
+    if encoding == "br":
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _to_http_time(value: datetime) -> datetime:
+    """Naive UTC database timestamp -> aware datetime truncated to seconds"""
+    return value.replace(microsecond=0, tzinfo=timezone.utc)
+
+
+def not_modified(etag: str, last_modified: datetime) -> Optional[Response]:
+    """
+    Answer a conditional GET before doing any work
+
+    Returns:
+        A 304 response if the client's copy is current, otherwise None
+    """
+    last_modified = _to_http_time(last_modified)
+
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since:
+        fresh = last_modified <= request.if_modified_since
+    else:
+        fresh = False
+
+    if not fresh:
+        return None
+
+    response = Response(status=304)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime) -> Response:
+    """
+    Attach ETag/Last-Modified and require revalidation on every use
+
+    Last-Modified has one-second resolution, so it is only sent once its
+    second has passed; a client holding it has then seen every write made
+    in that second. Until then clients revalidate with the ETag alone.
+    """
+    response.set_etag(etag, weak=True)
+    last_modified = _to_http_time(last_modified)
+    if last_modified < datetime.now(timezone.utc).replace(microsecond=0):
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+
+def compress_response(response: Response) -> Response:
+    """Gzip/brotli-compress eligible responses (use as an after_request hook)"""
+    response.vary.add("Accept-Encoding")
+
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_TYPES
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+
+    encoding = _negotiate_encoding()
+    if not encoding:
+        return response
+
+    response.set_data(_compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+class AssetManifest:
+    """
+    Serve static files under content-hashed names (``app.<hash>.js``)
+
+    Hashed URLs change whenever the file changes, so responses can be cached
+    for a year as immutable. Compressed variants are built once per version.
+    """
+
+    def __init__(self, static_folder: str):
+        """Initialize manifest for a static folder"""
+        self.static_folder = static_folder
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, str, bytes]] = {}
+        self._compressed: Dict[Tuple[str, str, str], bytes] = {}
+
+    def hashed_name(self, filename: str) -> str:
+        """Content-hashed name for a static file, e.g. ``style.3f2a1b9c0d4e.css``"""
+        _, digest, _ = self._load(filename)
+        stem, ext = os.path.splitext(filename)
+        return f"{stem}.{digest}{ext}"
+
+    def response(self, hashed_filename: str, mimetype: str) -> Response:
+        """Build a long-lived cached response for a hashed asset name"""
+        stem, ext = os.path.splitext(hashed_filename)
+        stem, _, digest = stem.rpartition(".")
+        filename = stem + ext
+
+        try:
+            _, current_digest, data = self._load(filename)
+        except (FileNotFoundError, ValueError):
+            abort(404)
+
+        if digest != current_digest:
+            # Stale or unknown hash; never cache it under this name
+            abort(404)
+
+        response = Response(mimetype=mimetype)
+        response.cache_control.public = True
+        response.cache_control.max_age = ASSET_MAX_AGE
+        response.cache_control.immutable = True
+        response.vary.add("Accept-Encoding")
+
+        encoding = _negotiate_encoding() if mimetype in COMPRESSIBLE_TYPES else None
+        if encoding:
+            key = (filename, digest, encoding)
+            with self._lock:
+                if key not in self._compressed:
+                    self._compressed[key] = _compress(data, encoding)
+                body = self._compressed[key]
+            response.headers["Content-Encoding"] = encoding
+            # Each coding is a different representation and needs its own tag
+            response.set_etag(f"{digest}-{encoding}")
+        else:
+            body = data
+            response.set_etag(digest)
+
+        response.set_data(body)
+        return response.make_conditional(request)
+
+    def _load(self, filename: str) -> Tuple[float, str, bytes]:
+        """Read (and cache by mtime) a static file and its content hash"""
+        path = os.path.normpath(os.path.join(self.static_folder, filename))
+        if not path.startswith(os.path.normpath(self.static_folder) + os.sep):
+            raise ValueError(f"Invalid asset path: {filename}")
+
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry and entry[0] == mtime:
+                return entry
+
+        with open(path, "rb") as f:
+            data = f.read()
+        entry = (mtime, hashlib.sha256(data).hexdigest()[:12], data)
+
+        with self._lock:
+            self._entries[filename] = entry
+        return entry
@@ -3,27 +3,70 @@ Web UI using Flask
 Simple interface for resume matching
 """
 
+import io
 import os
-import json
-from flask import Flask, render_template, request, jsonify
+import mimetypes
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime, timedelta
+from flask import Flask, Request, Response, render_template, request, jsonify, stream_with_context, url_for
 from werkzeug.utils import secure_filename
 
 from core.matcher import Matcher
 from core.database import Database
-from core.resume_parser import ResumeParser
+from core.batch import WEB_RUN_PREFIX, BatchJob, BatchProcessor, RunCheckpointer, list_archive
+from core.storage import UploadStore
+from core.singleflight import SingleFlight, request_key
+from core.dedup import NearDuplicateFinder
+from core.cascade import CascadeStats, cascade_stats
+from core.export import FORMATS, iter_export, iter_import
 from core.jd_parser import JDParser
+from ui.http_cache import AssetManifest, compress_response, not_modified, set_validators
 from config import Config
 
+
+class UploadRequest(Request):
+    """Request whose body limit is raised for bulk uploads only"""
+    
+    @property
+    def max_content_length(self):
+        """Body size limit for this request's endpoint"""
+        if self.endpoint == "api_batch":
+            return Config.MAX_BATCH_UPLOAD_BYTES
+        return super().max_content_length
+
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16MB max file size
-UPLOAD_FOLDER = "uploads"
+app.config["UPLOAD_FOLDER"] = Config.UPLOAD_FOLDER
 
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+# Content-addressed upload storage (deduplicated, size/age bounded)
+upload_store = UploadStore(app.config["UPLOAD_FOLDER"])
 
 # Initialize database
 db = Database()
 
+# Coalesce identical in-flight match requests (optionally across workers)
+match_flight = SingleFlight(db if Config.SINGLE_FLIGHT_CROSS_WORKER else None)
+
+# Reuse stored scores for resumes resubmitted with trivial edits
+near_dups = NearDuplicateFinder(db)
+
+# Content-hashed static assets served with long-lived cache headers
+assets = AssetManifest(app.static_folder)
+app.jinja_env.globals["asset_url"] = lambda filename: url_for("hashed_asset", filename=assets.hashed_name(filename))
+
+# Compress JSON/text responses (brotli when installed, else gzip)
+app.after_request(compress_response)
+
+
+@app.teardown_appcontext
+def remove_db_session(exception=None):
+    """Release this request's database session"""
+    db.remove_session()
+
 
 @app.route("/")
 def index():
@@ -31,6 +74,13 @@ def index():
     return render_template("index.html")
 
 
+@app.route("/assets/<path:filename>")
+def hashed_asset(filename):
+    """Serve a static file by its content-hashed name"""
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return assets.response(filename, mimetype)
+
+
 @app.route("/api/match", methods=["POST"])
 def api_match():
     """API endpoint for matching"""
@@ -47,20 +97,47 @@ def api_match():
         if not resume_text or not jd_text:
             return jsonify({"error": "Both resume and JD are required"}), 400
         
-        # Perform matching
-        matcher = Matcher()
-        result = matcher.match(resume_text, jd_text, include_recommendations=True)
-        
-        # Save to database if requested
-        if save_match:
-            record = db.save_match(
-                resume_text=resume_text,
-                jd_text=jd_text,
-                score=result["score"],
-                explanation=result["explanation"],
-                recommendations=result.get("recommendations", []),
-            )
-            result["id"] = record.id
+        def compute():
+            # Check for a stored match of a near-identical resume against this JD
+            duplicate = None
+            signature = None
+            if Config.NEAR_DUP_MODE != "off":
+                signature = near_dups.hasher.signature(resume_text)
+                duplicate = near_dups.find_match(resume_text, jd_text, signature)
+            
+            if duplicate and Config.NEAR_DUP_MODE == "reuse":
+                record, similarity = duplicate
+                return dict(record.to_dict(), near_duplicate_of=record.id, similarity=round(similarity, 3))
+            
+            # Perform matching
+            matcher = Matcher()
+            result = matcher.match(resume_text, jd_text, include_recommendations=True)
+            
+            if duplicate:
+                record, similarity = duplicate
+                result["near_duplicate_of"] = record.id
+                result["similarity"] = round(similarity, 3)
+            
+            # Save to database if requested
+            if save_match:
+                record = db.save_match(
+                    resume_text=resume_text,
+                    jd_text=jd_text,
+                    score=result["score"],
+                    explanation=result["explanation"],
+                    recommendations=result.get("recommendations", []),
+                )
+                result["id"] = record.id
+                
+                if signature is not None:
+                    near_dups.record(record.id, resume_text, jd_text, signature)
+            
+            return result
+        
+        # Identical concurrent requests (e.g. double-clicks) share one computation
+        key = request_key(resume_text, jd_text, recommendations=True, save=bool(save_match))
+        result, shared = match_flight.do(key, compute)
+        result = dict(result, coalesced=shared)
         
         return jsonify(result)
     
@@ -87,19 +164,187 @@ def api_upload_resume():
         if ext not in allowed_extensions:
             return jsonify({"error": f"File type not allowed. Allowed: {allowed_extensions}"}), 400
         
-        # Save file
-        filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-        file.save(filepath)
+        # Store under content hash; identical files share one blob and text cache
+        upload = upload_store.save(file.stream, filename, max_size=Config.MAX_RESUME_FILE_BYTES)
+        
+        # Extract text (cached per content hash)
+        resume_text = upload_store.extract_text(upload)
+        
+        return jsonify({"text": resume_text, "filename": filename, "hash": upload.digest})
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+def _spool_batch_upload(files):
+    """
+    Copy a batch upload into a temporary ZIP archive for background processing
+    
+    A single ``archive`` upload is copied as-is; multiple ``files`` are packed
+    into an uncompressed archive so both paths are processed the same way.
+    """
+    spool = tempfile.TemporaryFile()
+    try:
+        if "archive" in files:
+            shutil.copyfileobj(files["archive"].stream, spool)
+        else:
+            with zipfile.ZipFile(spool, "w", zipfile.ZIP_STORED) as archive:
+                used = set()
+                for file in files.getlist("files"):
+                    if not file.filename:
+                        continue
+                    name = _unique_name(secure_filename(file.filename), used)
+                    with archive.open(name, "w") as entry:
+                        shutil.copyfileobj(file.stream, entry)
+        
+        if not zipfile.is_zipfile(spool):
+            raise zipfile.BadZipFile("Not a ZIP archive")
+        spool.seek(0)
+        return spool
+    except Exception:
+        spool.close()
+        raise
+
+
+def _unique_name(name, used):
+    """Suffix a filename so each entry of a packed upload has its own name"""
+    stem, ext = os.path.splitext(name)
+    candidate, n = name, 1
+    while candidate in used:
+        n += 1
+        candidate = f"{stem}-{n}{ext}"
+    used.add(candidate)
+    return candidate
+
+
+def _batch_progress(run, include_results=True):
+    """Build the batch job response from a persisted run"""
+    counts = run["counts"]
+    status, error = run["status"], run["error"]
+    heartbeat_age = datetime.utcnow() - datetime.fromisoformat(run["updated_at"])
+    if status == "running" and heartbeat_age > timedelta(seconds=Config.BATCH_HEARTBEAT_TIMEOUT):
+        # The worker running this job was restarted or killed
+        status, error = "interrupted", "Batch job stopped before finishing; please resubmit"
+    
+    data = {
+        "id": run["id"],
+        "status": status,
+        "total": sum(counts.values()),
+        "scored": counts.get("completed", 0),
+        "duplicates": counts.get("duplicate", 0),
+        "failed": counts.get("failed", 0),
+        "pending": counts.get("pending", 0),
+        "error": error,
+        "created_at": run["created_at"],
+    }
+    if run["stats"]:
+        stats = CascadeStats()
+        stats.add_state(run["stats"])
+        data["model_stats"] = stats.to_dict()
+    if include_results:
+        results = []
+        for item in db.list_run_items(run["id"], statuses=["completed", "duplicate", "failed"]):
+            result = {"name": item["name"], "status": item["status"]}
+            if item["status"] == "failed":
+                result["error"] = item["error"]
+            else:
+                for key in ("duplicate_of", "near_duplicate_of", "similarity"):
+                    if item[key] is not None:
+                        result[key] = item[key]
+                result.update(
+                    score=item["score"],
+                    explanation=item["explanation"],
+                    recommendations=item["recommendations"],
+                    id=item["match_id"],
+                )
+            results.append(result)
+        data["results"] = sorted(
+            results,
+            key=lambda r: r["score"] if r.get("score") is not None else -1,
+            reverse=True,
+        )
+    return data
+
+
+@app.route("/api/batch", methods=["POST"])
+def api_batch():
+    """Start a bulk screening job from a ZIP archive or multiple files"""
+    try:
+        if "archive" not in request.files and not request.files.getlist("files"):
+            return jsonify({"error": "Provide a ZIP 'archive' or one or more 'files'"}), 400
+        
+        jd_text = request.form.get("jd", "").strip()
+        if not jd_text:
+            return jsonify({"error": "Job description is required"}), 400
+        JDParser.validate(jd_text)
+        
+        save = request.form.get("save", "false").lower() == "true"
+        include_recommendations = request.form.get("recommendations", "false").lower() == "true"
         
-        # Extract text
-        resume_text = ResumeParser.parse(filepath)
+        finder = near_dups if Config.NEAR_DUP_MODE != "off" else None
+        processor = BatchProcessor(Matcher(), db, finder=finder)
         
-        return jsonify({"text": resume_text, "filename": filename})
+        try:
+            archive = _spool_batch_upload(request.files)
+        except zipfile.BadZipFile:
+            return jsonify({"error": "Uploaded archive is not a valid ZIP file"}), 400
+        
+        try:
+            names = list_archive(archive)
+            archive.seek(0)
+            if not names:
+                archive.close()
+                return jsonify({"error": "No supported resume files in upload"}), 400
+        except Exception:
+            archive.close()
+            raise
+        
+        # Expire old web jobs so their stored results do not accumulate
+        db.purge_runs(WEB_RUN_PREFIX, timedelta(hours=Config.BATCH_JOB_TTL_HOURS))
+        
+        upload_name = request.files["archive"].filename if "archive" in request.files else f"{len(names)} files"
+        options = {"save": save, "recommendations": include_recommendations}
+        run_id = db.create_run(WEB_RUN_PREFIX + (upload_name or "archive"), jd_text, names, options)
+        item_ids = {item["name"]: item["id"] for item in db.list_run_items(run_id)}
+        
+        job = BatchJob(jd_text, checkpointer=RunCheckpointer(db, item_ids, run_id), run_id=run_id)
+        processor.start(job, archive, save=save, include_recommendations=include_recommendations)
+        
+        return jsonify(_batch_progress(db.get_run(run_id), include_results=False)), 202
     
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/batch/<int:job_id>", methods=["GET"])
+def api_batch_status(job_id):
+    """Get progress and results of a batch job (served by any worker)"""
+    try:
+        run = db.get_run(job_id)
+        
+        if not run:
+            return jsonify({"error": "Batch job not found"}), 404
+        
+        include_results = request.args.get("results", "true").lower() == "true"
+        return jsonify(_batch_progress(run, include_results=include_results))
+    
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/cascade-stats", methods=["GET"])
+def api_cascade_stats():
+    """
+    Per-tier call counts, latency and agreement of the scoring cascade
+    
+    Counters are per worker process (``pid`` says which one answered); a
+    batch job's own totals are reported in ``/api/batch/<job_id>``.
+    """
+    return jsonify(dict(cascade_stats.to_dict(), enabled=Config.CASCADE_ENABLED, pid=os.getpid()))
+
+
 @app.route("/api/matches", methods=["GET"])
 def api_list_matches():
     """List all stored matches"""
@@ -107,10 +352,17 @@ def api_list_matches():
         limit = request.args.get("limit", 50, type=int)
         order_by = request.args.get("order", "score")
         
+        # Revalidate against the change counter before touching the matches table
+        version, updated_at = db.get_version()
+        etag = f"m{version}"
+        cached = not_modified(etag, updated_at)
+        if cached:
+            return cached
+        
         matches = db.list_matches(limit=limit, order_by=order_by)
         stats = db.get_stats()
         
-        return jsonify({
+        response = jsonify({
             "stats": stats,
             "matches": [
                 {
@@ -118,34 +370,83 @@ def api_list_matches():
                     "score": m.score,
                     "explanation": m.explanation,
                     "timestamp": m.timestamp.isoformat(),
-                    "recommendations": json.loads(m.recommendations) if m.recommendations else [],
+                    "recommendations": m.recommendations,
                 }
                 for m in matches
             ],
         })
+        return set_validators(response, etag, updated_at)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/matches/export", methods=["GET"])
+def api_export_matches():
+    """Stream the full match history as CSV or JSONL"""
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in FORMATS:
+        return jsonify({"error": f"Unsupported format. Allowed: {sorted(FORMATS)}"}), 400
+    
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(
+        stream_with_context(iter_export(db.iter_matches(), fmt)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=matches.{fmt}"},
+    )
+
+
+@app.route("/api/matches/import", methods=["POST"])
+def api_import_matches():
+    """Bulk import match history from an uploaded CSV or JSONL file"""
+    try:
+        if "file" not in request.files:
+            return jsonify({"error": "No file provided"}), 400
+        
+        file = request.files["file"]
+        fmt = request.form.get("format") or os.path.splitext(file.filename or "")[1].lstrip(".").lower()
+        if fmt == "ndjson":
+            fmt = "jsonl"
+        if fmt not in FORMATS:
+            return jsonify({"error": f"Unsupported format. Allowed: {sorted(FORMATS)}"}), 400
+        
+        stream = io.TextIOWrapper(file.stream, encoding="utf-8", newline="")
+        imported = db.bulk_import_matches(iter_import(stream, fmt))
+        
+        return jsonify({"imported": imported})
+    
+    except ValueError as e:
+        # The import is atomic, so a bad row means nothing was stored
+        return jsonify({"error": str(e), "imported": 0}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/api/match/<int:match_id>", methods=["GET"])
 def api_get_match(match_id):
     """Get specific match details"""
     try:
+        version, updated_at = db.get_version()
+        etag = f"m{version}-{match_id}"
+        cached = not_modified(etag, updated_at)
+        if cached:
+            return cached
+        
         match = db.get_match(match_id)
         
         if not match:
             return jsonify({"error": "Match not found"}), 404
         
-        return jsonify({
+        response = jsonify({
             "id": match.id,
             "score": match.score,
             "explanation": match.explanation,
-            "recommendations": json.loads(match.recommendations) if match.recommendations else [],
+            "recommendations": match.recommendations,
             "timestamp": match.timestamp.isoformat(),
             "resume_preview": match.resume_text[:500],
             "jd_preview": match.jd_text[:500],
         })
+        return set_validators(response, etag, updated_at)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500